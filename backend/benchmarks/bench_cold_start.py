@@ -0,0 +1,83 @@
+"""
+Cold-start time and import profile of the API process.
+
+Each run starts a fresh interpreter that imports ``server`` (which builds
+the app through ``create_app``) under ``-X importtime``. Lifespan startup
+is not included since it needs a reachable MongoDB.
+
+    python -m benchmarks.bench_cold_start [--runs 10] [--top 25]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import write_results
+
+BACKEND_DIR = Path(__file__).parent.parent
+STARTUP_SCRIPT = "import server; server.create_app()"
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """
+    Parse ``-X importtime`` output into per-module self/cumulative microseconds
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return modules
+
+
+def run_once(importtime: bool) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", STARTUP_SCRIPT]
+    return subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True, env=dict(os.environ), check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        run_once(importtime=False)
+        timings.append(time.perf_counter() - start)
+
+    profile = parse_importtime(run_once(importtime=True).stderr)
+    heaviest = sorted(profile, key=lambda entry: entry["cumulative_us"], reverse=True)[:args.top]
+
+    results = {
+        "runs": args.runs,
+        "cold_start_median_ms": statistics.median(timings) * 1000,
+        "cold_start_min_ms": min(timings) * 1000,
+        "cold_start_max_ms": max(timings) * 1000,
+        "modules_imported": len(profile),
+        "heaviest_imports": heaviest,
+    }
+
+    print(f"cold start median {results['cold_start_median_ms']:.1f}ms over {args.runs} runs, {len(profile)} modules")
+    for entry in heaviest:
+        print(f"  {entry['cumulative_us'] / 1000:>8.1f}ms  {entry['module']}")
+    print(f"results written to {write_results('cold_start', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
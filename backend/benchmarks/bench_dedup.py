@@ -0,0 +1,92 @@
+"""
+Cost and accuracy of near-duplicate detection: MinHash signatures per
+message size, and banded LSH lookups against an index holding 100k recent
+signatures, for unseen messages and for lightly edited resubmissions.
+
+Messages are drawn from a Zipf-weighted vocabulary whose head is the
+stopword list, so word frequencies resemble real text.
+
+    python -m benchmarks.bench_dedup [--entries 100000] [--lookups 5000]
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from benchmarks.common import print_table, summarize, time_calls, write_results
+from utils.dedup import CONTACT_DEDUP_THRESHOLD, STOPWORDS, MinHashIndex, minhash, words
+
+VOCABULARY_SIZE = 20000
+
+
+def make_vocabulary(rng: random.Random, size: int = VOCABULARY_SIZE):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = sorted(STOPWORDS) + ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    return vocabulary, cumulative
+
+
+def make_text(rng: random.Random, vocabulary, word_count: int) -> str:
+    return " ".join(rng.choices(vocabulary[0], cum_weights=vocabulary[1], k=word_count))
+
+
+def edit(rng: random.Random, vocabulary, text: str, changes: int = 2) -> str:
+    tokens = text.split()
+    for _ in range(changes):
+        tokens[rng.randrange(len(tokens))] = rng.choices(vocabulary[0], cum_weights=vocabulary[1])[0]
+    return " ".join(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    vocabulary = make_vocabulary(rng)
+    rows = {}
+
+    for word_count in (20, 80, 300):
+        texts = itertools.cycle([make_text(rng, vocabulary, word_count) for _ in range(200)])
+        rows[f"signature_{word_count}_words"] = summarize(time_calls(lambda: minhash(words(next(texts))), args.lookups))
+
+    started = time.perf_counter()
+    index = MinHashIndex(max_entries=args.entries, window_seconds=float("inf"))
+    stored = []
+    stride = max(1, args.entries // args.lookups)
+    for i in range(args.entries):
+        text = make_text(rng, vocabulary, rng.randint(20, 80))
+        if i % stride == 0:
+            stored.append(text)
+        index.add(str(i), minhash(words(text)))
+    build_seconds = time.perf_counter() - started
+
+    unseen = [minhash(words(make_text(rng, vocabulary, rng.randint(20, 80)))) for _ in range(args.lookups)]
+    edited = [minhash(words(edit(rng, vocabulary, text))) for text in stored]
+    unseen_iter, edited_iter = iter(unseen), iter(edited)
+    rows["lookup_unseen"] = summarize(time_calls(lambda: index.most_similar(next(unseen_iter)), len(unseen)))
+    rows["lookup_edited"] = summarize(time_calls(lambda: index.most_similar(next(edited_iter)), len(edited)))
+
+    recall = sum(index.most_similar(signature) is not None for signature in edited) / len(edited)
+    false_positives = sum(index.most_similar(signature) is not None for signature in unseen) / len(unseen)
+
+    print_table(rows)
+    print(f"\nindex of {len(index)} signatures built in {build_seconds:.1f}s, threshold {CONTACT_DEDUP_THRESHOLD}")
+    print(f"recall on 2-word edits {recall:.1%}, false positives on unseen messages {false_positives:.2%}")
+
+    results = {
+        "entries": len(index),
+        "build_seconds": build_seconds,
+        "threshold": CONTACT_DEDUP_THRESHOLD,
+        "recall_two_word_edits": recall,
+        "false_positive_rate": false_positives,
+        "cases": rows,
+    }
+    print(f"results written to {write_results('dedup', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Per-check latency of the in-memory rate limiter with 10k distinct IPs.
+
+    python -m benchmarks.bench_rate_limiter [--ips 10000] [--checks 200000]
+"""
+
+import argparse
+import random
+
+from benchmarks.common import print_table, summarize, time_calls, write_results
+from utils.rate_limiter import SlidingWindowRateLimiter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ips", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.ips)]
+    results = {}
+
+    # Steady state: every IP already has state, checks are uniformly spread
+    limiter = SlidingWindowRateLimiter(max_requests=5, window_seconds=3600, max_entries=args.ips)
+    for ip in ips:
+        limiter.hit(ip)
+    picks = iter([rng.choice(ips) for _ in range(args.checks)])
+    results["steady_state_10k_ips"] = summarize(time_calls(lambda: limiter.hit(next(picks)), args.checks))
+
+    # Eviction churn: twice as many IPs as the LRU capacity
+    limiter = SlidingWindowRateLimiter(max_requests=5, window_seconds=3600, max_entries=args.ips // 2)
+    picks = iter([rng.choice(ips) for _ in range(args.checks)])
+    results["lru_eviction_churn"] = summarize(time_calls(lambda: limiter.hit(next(picks)), args.checks))
+
+    # Hot IP that is always over the limit
+    limiter = SlidingWindowRateLimiter(max_requests=5, window_seconds=3600, max_entries=args.ips)
+    results["rejected_hot_ip"] = summarize(time_calls(lambda: limiter.hit("203.0.113.7"), args.checks))
+
+    print_table(results)
+    print(f"results written to {write_results('rate_limiter', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Response encoding cost per page: FastAPI's jsonable_encoder plus the
+stdlib-backed JSONResponse against the orjson-backed FastJSONResponse,
+for admin contact pages and status check pages. Also compares building
+the stats and root responses per request with serving pre-encoded bytes.
+
+    python -m benchmarks.bench_serialization [--iterations 500]
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from benchmarks.bench_spam_filter import make_message
+from benchmarks.common import print_table, summarize, time_calls, write_results
+from models.contact import PortfolioStats
+from utils.serialization import FastJSONResponse, PreEncodedJSONResponse, dumps
+
+STATS = {"total_projects": 15, "total_contacts": 1234, "technologies": 20, "years_experience": 3}
+ROOT = {"message": "Siddharth Singh Portfolio API - Backend is running!"}
+
+
+def make_contacts(rng: random.Random, count: int):
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "name": f"Sender {i}",
+        "email": f"sender{i}@example.com",
+        "subject": "Data engineering opportunity",
+        "message": make_message(rng, rng.randint(200, 2000)),
+        "timestamp": now - timedelta(minutes=i),
+        "status": "new",
+        "ip_address": "203.0.113.7",
+        "user_agent": "Mozilla/5.0 (X11; Linux x86_64)",
+    } for i in range(count)]
+
+
+def make_status_checks(count: int):
+    now = datetime.utcnow()
+    return [{"id": str(uuid.uuid4()), "client_name": f"probe-{i}", "timestamp": now - timedelta(seconds=i)} for i in range(count)]
+
+
+def legacy_contacts_page(messages):
+    # Copy first: the original route stringified _id in place
+    page = [dict(message) for message in messages]
+    for message in page:
+        message["_id"] = str(message["_id"])
+    return JSONResponse(jsonable_encoder({"messages": page, "total": 1234, "skip": 0, "limit": len(page), "next_cursor": None})).body
+
+
+def current_contacts_page(messages):
+    page = [dict(message) for message in messages]
+    return FastJSONResponse({"messages": page, "total": 1234, "skip": 0, "limit": len(page), "next_cursor": None}).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    encoded_stats = dumps(STATS)
+    encoded_root = dumps(ROOT)
+    cases = {}
+    for size in (50, 200):
+        messages = make_contacts(rng, size)
+        cases[f"contacts_{size}_legacy"] = lambda messages=messages: legacy_contacts_page(messages)
+        cases[f"contacts_{size}_orjson"] = lambda messages=messages: current_contacts_page(messages)
+    for size in (100, 1000):
+        checks = make_status_checks(size)
+        cases[f"status_{size}_legacy"] = lambda checks=checks: JSONResponse(jsonable_encoder(checks)).body
+        cases[f"status_{size}_orjson"] = lambda checks=checks: FastJSONResponse(checks).body
+    cases["stats_legacy"] = lambda: JSONResponse(jsonable_encoder(PortfolioStats(**STATS))).body
+    cases["stats_pre_encoded"] = lambda: PreEncodedJSONResponse(encoded_stats).body
+    cases["root_legacy"] = lambda: JSONResponse(jsonable_encoder(ROOT)).body
+    cases["root_pre_encoded"] = lambda: PreEncodedJSONResponse(encoded_root).body
+
+    rows = {}
+    for name, fn in cases.items():
+        time_calls(fn, 20)
+        rows[name] = summarize(time_calls(fn, args.iterations))
+    print_table(rows)
+
+    speedups = {}
+    for name in rows:
+        if name.endswith("_legacy"):
+            base = name[:-len("_legacy")]
+            current = next(key for key in rows if key.startswith(base) and key != name)
+            speedups[base] = rows[name]["p50_us"] / rows[current]["p50_us"]
+            print(f"{base:<20} x{speedups[base]:.1f}")
+
+    print(f"results written to {write_results('serialization', {'cases': rows, 'speedup_p50': speedups}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
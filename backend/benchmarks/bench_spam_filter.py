@@ -0,0 +1,107 @@
+"""
+Throughput of the compiled spam classifier against the original
+per-pattern ``re.search`` loop on 2000-char messages. The legacy
+function returns at the first hit; the classifier is timed both with its
+full rule report and with ``stop_at_threshold``, the boolean path
+``is_spam_message`` uses.
+
+    python -m benchmarks.bench_spam_filter [--messages 2000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from benchmarks.common import write_results
+from utils.spam_filter import spam_classifier
+
+LEGACY_SPAM_PATTERNS = [
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
+    r'buy now',
+    r'click here',
+    r'limited time',
+    r'free money',
+    r'make money fast',
+    r'casino',
+    r'viagra',
+    r'pills'
+]
+
+VOCABULARY = (
+    "hello siddharth i came across your portfolio and wanted to talk about a data "
+    "engineering role on our team we work with python spark airflow and aws would "
+    "you be open to a short call next week thanks for your time regards"
+).split()
+
+
+def legacy_is_spam_message(message: str) -> bool:
+    """
+    The original implementation, kept here as the baseline
+    """
+    message_lower = message.lower()
+    for pattern in LEGACY_SPAM_PATTERNS:
+        if re.search(pattern, message_lower):
+            return True
+    words = message_lower.split()
+    if len(words) > 5:
+        if len(set(words)) < len(words) * 0.3:
+            return True
+    return False
+
+
+def make_message(rng: random.Random, length: int = 2000, spam: bool = False) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(VOCABULARY).capitalize() if rng.random() < 0.1 else rng.choice(VOCABULARY)
+        words.append(word)
+        size += len(word) + 1
+    if spam:
+        words.insert(rng.randrange(len(words)), "click here")
+    return " ".join(words)[:length]
+
+
+def throughput(fn, messages, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            fn(message)
+    return len(messages) * rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    corpora = {
+        "clean_2000_chars": [make_message(rng) for _ in range(args.messages)],
+        "spam_2000_chars": [make_message(rng, spam=True) for _ in range(args.messages)],
+    }
+
+    results = {}
+    for name, messages in corpora.items():
+        legacy = throughput(legacy_is_spam_message, messages, args.rounds)
+        compiled = throughput(spam_classifier.classify, messages, args.rounds)
+        short = throughput(lambda message: spam_classifier.classify(message, stop_at_threshold=True), messages, args.rounds)
+        results[name] = {
+            "legacy_msgs_per_s": legacy,
+            "compiled_msgs_per_s": compiled,
+            "short_circuit_msgs_per_s": short,
+            "speedup": compiled / legacy,
+            "short_circuit_speedup": short / legacy,
+        }
+        print(
+            f"{name:<20} legacy {legacy:>10.0f}/s  compiled {compiled:>10.0f}/s  x{compiled / legacy:.2f}"
+            f"  short-circuit {short:>10.0f}/s  x{short / legacy:.2f}"
+        )
+
+    print(f"results written to {write_results('spam_filter', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
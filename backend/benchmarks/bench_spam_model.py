@@ -0,0 +1,114 @@
+"""
+Trained spam model against the keyword rules: accuracy on a synthetic
+labeled corpus that includes legitimate messages mentioning "pills" or
+"click here", single-message scoring latency, and batch rescoring
+throughput of the vectorized ``probabilities`` against a per-message loop.
+
+    python -m benchmarks.bench_spam_model [--train 4000] [--test 2000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.bench_spam_filter import VOCABULARY
+from benchmarks.common import print_table, summarize, time_calls, write_results
+from utils.spam_filter import spam_classifier
+from utils.spam_model import train_spam_model
+
+SPAM_VOCABULARY = (
+    "buy cheap pills online now limited offer guaranteed winner claim your prize "
+    "crypto investment double returns click here unsubscribe exclusive deal casino "
+    "bonus free trial act fast"
+).split()
+
+# Legitimate messages that trip the keyword rules
+AWKWARD_HAM = [
+    "my startup ships a reminder app for taking pills on time",
+    "click here in the dashboard demo did not open the spark job",
+    "we track pills and prescriptions in our pharmacy data warehouse",
+]
+
+
+def make_text(rng: random.Random, vocabulary, words: int) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def make_corpus(rng: random.Random, count: int):
+    texts, labels = [], []
+    for _ in range(count):
+        spam = rng.random() < 0.3
+        if spam:
+            # Spam borrows some ordinary words so it is not trivially separable
+            text = make_text(rng, SPAM_VOCABULARY + VOCABULARY * 2, rng.randint(15, 60))
+        else:
+            text = make_text(rng, VOCABULARY, rng.randint(20, 120))
+            if rng.random() < 0.2:
+                text = f"{text} {rng.choice(AWKWARD_HAM)}"
+        texts.append(text)
+        labels.append(spam)
+    return texts, labels
+
+
+def accuracy(predictions, labels):
+    false_positives = sum(p and not l for p, l in zip(predictions, labels))
+    false_negatives = sum(l and not p for p, l in zip(predictions, labels))
+    return {
+        "accuracy": 1 - (false_positives + false_negatives) / len(labels),
+        "false_positive_rate": false_positives / max(1, labels.count(False)),
+        "false_negative_rate": false_negatives / max(1, labels.count(True)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train", type=int, default=4000)
+    parser.add_argument("--test", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(22)
+    train_texts, train_labels = make_corpus(rng, args.train)
+    test_texts, test_labels = make_corpus(rng, args.test)
+
+    start = time.perf_counter()
+    model = train_spam_model(train_texts, train_labels)
+    train_seconds = time.perf_counter() - start
+
+    quality = {
+        "rules": accuracy([spam_classifier.classify(text).is_spam for text in test_texts], test_labels),
+        "model": accuracy([model.is_spam(text) for text in test_texts], test_labels),
+    }
+    for name, row in quality.items():
+        print(f"{name:<6} accuracy {row['accuracy']:.3f}  false positives {row['false_positive_rate']:.3f}  false negatives {row['false_negative_rate']:.3f}")
+
+    sample = test_texts[:500]
+    latency = {
+        "rules_classify": summarize([t for text in sample for t in time_calls(lambda: spam_classifier.classify(text), 1)]),
+        "model_probability": summarize([t for text in sample for t in time_calls(lambda: model.probability(text), 1)]),
+    }
+    print_table(latency)
+
+    batch = (test_texts * (args.batch // len(test_texts) + 1))[:args.batch]
+    start = time.perf_counter()
+    for text in batch:
+        model.probability(text)
+    loop_rate = len(batch) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    model.probabilities(batch)
+    vectorized_rate = len(batch) / (time.perf_counter() - start)
+    print(f"batch of {len(batch)}: loop {loop_rate:.0f}/s  vectorized {vectorized_rate:.0f}/s  x{vectorized_rate / loop_rate:.2f}")
+    print(f"trained on {args.train} messages in {train_seconds:.2f}s")
+
+    results = {
+        "quality": quality,
+        "latency": latency,
+        "batch": {"messages": len(batch), "loop_msgs_per_s": loop_rate, "vectorized_msgs_per_s": vectorized_rate},
+        "train_seconds": train_seconds,
+    }
+    print(f"results written to {write_results('spam_model', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
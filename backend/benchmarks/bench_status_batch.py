@@ -0,0 +1,59 @@
+"""
+Batch status-check ingestion against N single POSTs on a running server.
+
+    python -m benchmarks.bench_status_batch --base-url http://localhost:8001/api --items 500
+"""
+
+import argparse
+import time
+
+import requests
+
+from benchmarks.common import write_results
+
+
+def post_singles(session: requests.Session, base_url: str, items: int) -> float:
+    start = time.perf_counter()
+    for i in range(items):
+        response = session.post(f"{base_url}/status", json={"client_name": f"bench-single-{i}"})
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def post_batch(session: requests.Session, base_url: str, items: int, batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, items, batch_size):
+        body = [{"client_name": f"bench-batch-{i}"} for i in range(offset, min(items, offset + batch_size))]
+        response = session.post(f"{base_url}/status/batch", json=body)
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with requests.Session() as session:
+        singles = post_singles(session, args.base_url, args.items)
+        batched = post_batch(session, args.base_url, args.items, args.batch_size)
+
+    results = {
+        "items": args.items,
+        "batch_size": args.batch_size,
+        "single_posts_s": singles,
+        "batch_posts_s": batched,
+        "single_items_per_s": args.items / singles,
+        "batch_items_per_s": args.items / batched,
+        "speedup": singles / batched,
+    }
+    print(f"{args.items} single posts: {singles:.3f}s ({args.items / singles:.0f}/s)")
+    print(f"batches of {args.batch_size}: {batched:.3f}s ({args.items / batched:.0f}/s), x{singles / batched:.1f}")
+    print(f"results written to {write_results('status_batch', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
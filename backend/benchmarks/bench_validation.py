@@ -0,0 +1,129 @@
+"""
+Per-stage cost of the contact submission hot path: building the request
+model, validation, the spam check, building the stored model and
+serializing it, for message bodies up to the 2000-char limit.
+
+The end-to-end cases compare the original path (an unnormalized request
+model, re-stripping in ``validate_contact_message`` and full
+``ContactMessage`` validation) against the current path, where
+``ContactMessageCreate`` normalizes each field once and
+``ContactMessage.from_submission`` skips re-validation.
+
+    python -m benchmarks.bench_validation [--iterations 20000]
+"""
+
+import argparse
+import random
+
+from pydantic import BaseModel, EmailStr, Field
+
+from benchmarks.bench_spam_filter import make_message
+from benchmarks.common import print_table, summarize, time_calls, write_results
+from models.contact import ContactMessage, ContactMessageCreate
+from utils.spam_filter import classify_message
+from utils.validation import validate_contact_message
+
+MESSAGE_SIZES = (100, 500, 1000, 2000)
+CLIENT_IP = "203.0.113.7"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+
+class LegacyContactMessageCreate(BaseModel):
+    """
+    The request model before it normalized its own fields
+    """
+    name: str = Field(..., min_length=1, max_length=100)
+    email: EmailStr
+    subject: str = Field(..., min_length=1, max_length=200)
+    message: str = Field(..., min_length=1, max_length=2000)
+
+
+def legacy_validate_contact_message(contact_data) -> bool:
+    if not contact_data.name.strip():
+        return False
+    if not contact_data.subject.strip():
+        return False
+    if not contact_data.message.strip():
+        return False
+    return not classify_message(contact_data.message).is_spam
+
+
+def legacy_path(payload):
+    contact_data = LegacyContactMessageCreate(**payload)
+    legacy_validate_contact_message(contact_data)
+    return ContactMessage(
+        name=contact_data.name,
+        email=contact_data.email,
+        subject=contact_data.subject,
+        message=contact_data.message,
+        ip_address=CLIENT_IP,
+        user_agent=USER_AGENT
+    ).dict()
+
+
+def current_path(payload):
+    contact_data = ContactMessageCreate(**payload)
+    validate_contact_message(contact_data)
+    return ContactMessage.from_submission(contact_data, ip_address=CLIENT_IP, user_agent=USER_AGENT).model_dump()
+
+
+def make_payload(rng: random.Random, size: int):
+    return {
+        "name": "  Priya Raman ",
+        "email": "priya.raman@example.com",
+        "subject": " Data engineering role at a fintech startup ",
+        "message": f" {make_message(rng, size - 2)} ",
+    }
+
+
+def stage_cases(payload):
+    contact_data = ContactMessageCreate(**payload)
+    stored = ContactMessage.from_submission(contact_data, ip_address=CLIENT_IP, user_agent=USER_AGENT)
+    return {
+        "build_request_model": lambda: ContactMessageCreate(**payload),
+        "validate_contact_message": lambda: validate_contact_message(contact_data),
+        "spam_check": lambda: classify_message(contact_data.message),
+        "build_stored_model_validated": lambda: ContactMessage(
+            name=contact_data.name,
+            email=contact_data.email,
+            subject=contact_data.subject,
+            message=contact_data.message,
+            ip_address=CLIENT_IP,
+            user_agent=USER_AGENT
+        ),
+        "build_stored_model_constructed": lambda: ContactMessage.from_submission(
+            contact_data, ip_address=CLIENT_IP, user_agent=USER_AGENT
+        ),
+        "serialize_model_dump": stored.model_dump,
+        "end_to_end_legacy": lambda: legacy_path(payload),
+        "end_to_end_current": lambda: current_path(payload),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    results = {}
+    for size in MESSAGE_SIZES:
+        payload = make_payload(rng, size)
+        rows = {}
+        for name, fn in stage_cases(payload).items():
+            # Warm caches (regex, pydantic validators) before measuring
+            time_calls(fn, 200)
+            rows[name] = summarize(time_calls(fn, args.iterations))
+
+        legacy = rows["end_to_end_legacy"]["p50_us"]
+        current = rows["end_to_end_current"]["p50_us"]
+        print(f"\nmessage of {size} chars: end-to-end p50 x{legacy / current:.2f} faster")
+        print_table(rows)
+        results[f"message_{size}_chars"] = {"stages": rows, "end_to_end_speedup_p50": legacy / current}
+
+    print(f"results written to {write_results('validation', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
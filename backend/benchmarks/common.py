@@ -0,0 +1,94 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.::
+
+    python -m benchmarks.bench_rate_limiter
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize per-operation timings (seconds) in microseconds
+    """
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6 if ordered else 0.0,
+        "p50_us": percentile(ordered, 50) * 1e6,
+        "p95_us": percentile(ordered, 95) * 1e6,
+        "p99_us": percentile(ordered, 99) * 1e6,
+        "max_us": ordered[-1] * 1e6 if ordered else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[], Any], iterations: int) -> List[float]:
+    """
+    Time ``iterations`` calls of ``fn`` individually
+    """
+    samples = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        start = clock()
+        fn()
+        samples.append(clock() - start)
+    return samples
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def write_results(name: str, results: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """
+    Write benchmark results as JSON, tagged with the current commit
+    """
+    path = Path(output) if output else RESULTS_DIR / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "created_at": datetime.utcnow().isoformat(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def print_table(rows: Dict[str, Dict[str, float]]):
+    """
+    Print summaries produced by :func:`summarize`
+    """
+    print(f"{'case':<36} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}  (us)")
+    for name, row in rows.items():
+        print(
+            f"{name:<36} {row['mean_us']:>10.2f} {row['p50_us']:>10.2f} "
+            f"{row['p95_us']:>10.2f} {row['p99_us']:>10.2f}"
+        )
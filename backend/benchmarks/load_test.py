@@ -0,0 +1,238 @@
+"""
+Concurrent load test for the public and admin API endpoints.
+
+By default the app is built in-process with ``create_app`` against an
+in-memory MongoDB stand-in (mongomock-motor) and driven through httpx's
+ASGI transport, so it runs offline and needs no server. Pass
+``--base-url`` to drive a running deployment instead.
+
+mongomock does not implement ``$substrCP``, so the default summary view of
+the admin listing (``get_admin_contacts``) only runs against a live server;
+in-process runs exercise ``get_admin_contacts_full`` instead. Admin
+scenarios send ``ADMIN_API_TOKEN`` from the environment; in-process runs
+set one if it is missing.
+
+    python -m benchmarks.load_test [--requests 2000] [--concurrency 50]
+    python -m benchmarks.load_test --compare benchmarks/results/load_test.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import string
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.common import summarize, write_results
+
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def message_text(i: int) -> str:
+    # Distinct wording per request so near-duplicate detection lets every message through
+    rng = random.Random(i)
+    details = " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(12))
+    return f"Hello, I would like to discuss a data engineering project. Details: {details}."
+
+
+async def submit_contact(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    # A distinct client IP per request keeps the rate limiter out of the measurement
+    return await client.post(
+        "/api/contact",
+        json={
+            "name": f"Load Tester {i}",
+            "email": f"load{i}@example.com",
+            "subject": f"Project enquiry {i}",
+            "message": message_text(i),
+        },
+        headers={"X-Forwarded-For": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"},
+    )
+
+
+async def get_stats(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/stats")
+
+
+def admin_headers() -> Dict[str, str]:
+    return {"X-Admin-Token": os.environ.get("ADMIN_API_TOKEN", "")}
+
+
+async def list_contacts(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/admin/contacts", params={"limit": 50}, headers=admin_headers())
+
+
+async def list_contacts_full(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/admin/contacts", params={"limit": 50, "view": "full"}, headers=admin_headers())
+
+
+async def download_resume(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/resume/download")
+
+
+async def list_projects(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/projects")
+
+
+async def list_status(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.get("/api/status", params={"limit": 100})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "post_contact": submit_contact,
+    "get_stats": get_stats,
+    "get_admin_contacts": list_contacts,
+    "get_admin_contacts_full": list_contacts_full,
+    "get_resume_download": download_resume,
+    "get_projects": list_projects,
+    "get_status": list_status,
+}
+
+# Scenarios that need operators mongomock lacks
+LIVE_SERVER_ONLY = {"get_admin_contacts"}
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Issue ``requests`` calls from ``concurrency`` workers and summarise latency
+    """
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, i)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "rps": requests / elapsed,
+        "p50_ms": summary["p50_us"] / 1000,
+        "p95_ms": summary["p95_us"] / 1000,
+        "p99_ms": summary["p99_us"] / 1000,
+        "max_ms": summary["max_us"] / 1000,
+        "statuses": dict(statuses),
+    }
+
+
+async def seed(client: httpx.AsyncClient, contacts: int, status_checks: int):
+    await asyncio.gather(*(submit_contact(client, 1_000_000 + i) for i in range(contacts)))
+    for offset in range(0, status_checks, 500):
+        body = [{"client_name": f"probe-{i}"} for i in range(offset, min(status_checks, offset + 500))]
+        await client.post("/api/status/batch", json=body)
+
+
+@asynccontextmanager
+async def in_process_client():
+    """
+    httpx client bound to an in-process app backed by mongomock-motor
+    """
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("mongomock-motor is required for in-process runs (pip install mongomock-motor)")
+
+    os.environ.setdefault("MONGO_WARMUP", "false")
+    os.environ.setdefault("ADMIN_API_TOKEN", "loadtest")
+    from server import create_app
+
+    app = create_app(mongo_client=AsyncMongoMockClient())
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            yield client
+
+
+@asynccontextmanager
+async def remote_client(base_url: str, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        yield client
+
+
+def compare(current: Dict[str, Any], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\ncompared with {baseline_path} (revision {baseline.get('revision')})")
+    for name, result in current.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        print(
+            f"{name:<24} rps {result['rps'] - previous['rps']:>+10.1f} "
+            f"({(result['rps'] / previous['rps'] - 1) * 100:+.1f}%)  "
+            f"p99 {result['p99_ms'] - previous['p99_ms']:>+8.2f}ms"
+        )
+
+
+async def main_async(args) -> Dict[str, Any]:
+    client_context = remote_client(args.base_url, args.concurrency) if args.base_url else in_process_client()
+    results = {}
+    async with client_context as client:
+        if args.seed_contacts or args.seed_status:
+            await seed(client, args.seed_contacts, args.seed_status)
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, SCENARIOS[name], args.requests, args.concurrency)
+            row = results[name]
+            print(
+                f"{name:<24} {row['rps']:>9.1f} rps  p50 {row['p50_ms']:>7.2f}ms  "
+                f"p95 {row['p95_ms']:>7.2f}ms  p99 {row['p99_ms']:>7.2f}ms  {row['statuses']}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="Drive a running server instead of an in-process app")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=None)
+    parser.add_argument("--seed-contacts", type=int, default=500)
+    parser.add_argument("--seed-status", type=int, default=2000)
+    parser.add_argument("--compare", default=None, help="Previous results JSON to diff against")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    if args.scenarios is None:
+        args.scenarios = [name for name in SCENARIOS if args.base_url or name not in LIVE_SERVER_ONLY]
+
+    # Per-request client logging would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(main_async(args))
+    path = write_results("load_test", {
+        "target": args.base_url or "in-process (mongomock-motor)",
+        "scenarios": results,
+    }, args.output)
+    print(f"results written to {path}")
+
+    if args.compare:
+        with open(path) as f:
+            current = json.load(f)["results"]["scenarios"]
+        compare(current, args.compare)
+
+
+if __name__ == "__main__":
+    main()
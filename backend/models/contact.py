@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 from datetime import datetime
 import uuid
 
+ContactStatus = Literal['new', 'read', 'replied']
+
 class ContactMessage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str = Field(..., min_length=1, max_length=100)
@@ -10,7 +12,7 @@ class ContactMessage(BaseModel):
     subject: str = Field(..., min_length=1, max_length=200)
     message: str = Field(..., min_length=1, max_length=2000)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    status: Literal['new', 'read', 'replied'] = Field(default='new')
+    status: ContactStatus = Field(default='new')
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
 
@@ -32,20 +34,74 @@ class ContactMessage(BaseModel):
             raise ValueError('Message cannot be empty')
         return v.strip()
 
+    @classmethod
+    def from_submission(cls, contact_data: 'ContactMessageCreate', ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> 'ContactMessage':
+        """
+        Build a stored message from an already validated submission
+
+        ContactMessageCreate has normalized every field, so validation is
+        skipped rather than repeated; defaults (id, timestamp, status) are
+        still applied.
+        """
+        return cls.model_construct(
+            name=contact_data.name,
+            email=contact_data.email,
+            subject=contact_data.subject,
+            message=contact_data.message,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+
 class ContactMessageCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     email: EmailStr
     subject: str = Field(..., min_length=1, max_length=200)
     message: str = Field(..., min_length=1, max_length=2000)
 
+    @validator('name')
+    def validate_name(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('Name cannot be empty')
+        return v
+
+    @validator('subject')
+    def validate_subject(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('Subject cannot be empty')
+        return v
+
+    @validator('message')
+    def validate_message(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('Message cannot be empty')
+        return v
+
 class ContactMessageResponse(BaseModel):
     success: bool
     message: str
     id: str
     timestamp: datetime
 
+class ContactStatusTransition(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+    from_status: ContactStatus
+    to_status: ContactStatus
+
+class ContactStatusTransitionResponse(BaseModel):
+    from_status: ContactStatus
+    to_status: ContactStatus
+    requested: int
+    modified: int
+    skipped: int
+
 class PortfolioStats(BaseModel):
-    total_projects: int = 15
+    total_projects: int
     total_contacts: int
-    technologies: int = 20
-    years_experience: int = 3
\ No newline at end of file
+    technologies: int
+    years_experience: int
+
+class AdminPortfolioStats(PortfolioStats):
+    status_counts: Dict[str, int]
\ No newline at end of file
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+
+class Project(BaseModel):
+    id: str = Field(..., min_length=1, max_length=100, pattern=r'^[a-z0-9][a-z0-9-]*$')
+    title: str
+    description: str
+    category: str
+    icon: Optional[str] = None
+    technologies: List[str] = []
+    achievements: List[str] = []
+    github_url: Optional[str] = None
+    live_url: Optional[str] = None
+
+class Experience(BaseModel):
+    id: int
+    title: str
+    company: str
+    location: str
+    period: str
+    type: str
+    description: str
+    responsibilities: List[str] = []
+    technologies: List[str] = []
+
+class Skill(BaseModel):
+    name: str
+    level: int = Field(..., ge=0, le=100)
+    years_experience: int = Field(..., ge=0)
+
+class SkillCategory(BaseModel):
+    id: str
+    name: str
+    skills: List[Skill]
+
+class PortfolioContent(BaseModel):
+    projects: List[Project]
+    experience: List[Experience]
+    skills: List[SkillCategory]
+
+    @validator('projects')
+    def validate_project_ids(cls, v):
+        ids = [project.id for project in v]
+        if len(ids) != len(set(ids)):
+            raise ValueError('Project ids must be unique')
+        return v
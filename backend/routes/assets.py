@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Request
+from utils.static_cache import asset_response, static_cache
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/static/{asset_path:path}")
+async def get_static_asset(asset_path: str, request: Request):
+    """
+    Serve a file from the static directory out of the in-memory cache
+    """
+    asset = static_cache.get(asset_path)
+    if asset is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Static asset not found"
+        )
+    return asset_response(request, asset)
@@ -1,22 +1,79 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
 from motor.motor_asyncio import AsyncIOMotorClient
-from models.contact import ContactMessage, ContactMessageCreate, ContactMessageResponse, PortfolioStats
+from models.contact import (
+    ContactMessage, ContactMessageCreate, ContactMessageResponse, ContactStatus,
+    ContactStatusTransition, ContactStatusTransitionResponse, PortfolioStats, AdminPortfolioStats
+)
 from utils.validation import validate_contact_message, get_client_ip
 from utils.rate_limiter import check_rate_limit
+from utils.ingestion import contact_ingestion, queued_ingestion_enabled
+from utils.counters import STATS_CACHE_TAG, adjust_contact_counts, increment_contact_count, stats_cache
+from utils.pagination import KEYSET_SORT, RANKED_SORT, SCORE_FIELD, keyset_filter, next_cursor, ranked_keyset_filter
+from utils.database import get_database
+from utils.serialization import FastJSONResponse, PreEncodedJSONResponse
+from utils.dedup import CONTACT_DEDUP_MAX_RECORDED, DUPLICATES_FIELD, contact_dedup
+from utils.notifications import enqueue_notifications
+from utils.metrics import DUPLICATE_SUBMISSIONS
+from utils.response_cache import cache_response
+from datetime import datetime, timezone
 import logging
-from typing import List
-import os
+from typing import Any, Dict, Literal, Optional
 
 router = APIRouter()
-
-# Get database from app state
-def get_database():
-    from server import db
-    return db
+# Mounted under /api/admin behind require_admin by the app factory
+admin_router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
+# Characters of the message body shown in the admin list view
+CONTACT_PREVIEW_CHARS = 160
+
+# Summary rows for the admin list; full bodies come from the detail endpoint
+CONTACT_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "name": 1,
+    "email": 1,
+    "subject": 1,
+    "timestamp": 1,
+    "status": 1,
+    "preview": {"$substrCP": ["$message", 0, CONTACT_PREVIEW_CHARS]},
+    "message_length": {"$strLenCP": "$message"},
+}
+
+# Status moves the admin inbox may make; messages only move forward
+CONTACT_STATUS_TRANSITIONS = {("new", "read"), ("new", "replied"), ("read", "replied")}
+
+def _as_utc_naive(value: datetime) -> datetime:
+    """
+    Timestamps are stored as naive UTC; convert aware query bounds to match
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def contact_filters(
+    status: Optional[str] = None,
+    email: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Build the Mongo filter for the admin listing's query parameters
+    """
+    filters: Dict[str, Any] = {}
+    if status:
+        filters["status"] = status
+    if email:
+        filters["email"] = email.strip()
+    if date_from or date_to:
+        filters["timestamp"] = {}
+        if date_from:
+            filters["timestamp"]["$gte"] = _as_utc_naive(date_from)
+        if date_to:
+            filters["timestamp"]["$lte"] = _as_utc_naive(date_to)
+    return filters
+
 @router.post("/contact", response_model=ContactMessageResponse)
 async def submit_contact_form(
     contact_data: ContactMessageCreate,
@@ -46,33 +103,84 @@ async def submit_contact_form(
             )
         
         # Create contact message
-        contact_message = ContactMessage(
-            name=contact_data.name,
-            email=contact_data.email,
-            subject=contact_data.subject,
-            message=contact_data.message,
+        contact_message = ContactMessage.from_submission(
+            contact_data,
             ip_address=client_ip,
             user_agent=user_agent
         )
         
-        # Save to database
-        result = await db.contact_messages.insert_one(contact_message.dict())
-        
-        if result.inserted_id:
-            logger.info(f"Contact message saved: {contact_message.id}")
-            
-            # Return success response
-            return ContactMessageResponse(
-                success=True,
-                message="Thank you for reaching out! I'll get back to you within 24 hours.",
-                id=contact_message.id,
-                timestamp=contact_message.timestamp
-            )
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to save contact message"
-            )
+        # Near-duplicates of a recent submission never reach the database
+        if contact_dedup.enabled:
+            duplicate = contact_dedup.check_and_add(contact_message.id, contact_message.subject, contact_message.message)
+            if duplicate is not None:
+                DUPLICATE_SUBMISSIONS.inc(contact_dedup.mode)
+                logger.info(f"Near-duplicate of {duplicate.key} ({duplicate.similarity:.0%} similar), action: {contact_dedup.mode}")
+                if contact_dedup.mode != "merge":
+                    # Matching is across senders, so this may not be the sender's own message
+                    raise HTTPException(
+                        status_code=409,
+                        detail="This message closely matches one received recently, so it was not sent again."
+                    )
+                # The sender may differ from the original's, so who sent it is kept
+                sender = {
+                    "name": contact_message.name,
+                    "email": contact_message.email,
+                    "ip_address": contact_message.ip_address,
+                    "user_agent": contact_message.user_agent,
+                    "timestamp": contact_message.timestamp,
+                    "similarity": round(duplicate.similarity, 3),
+                }
+                await db.contact_messages.update_one(
+                    {"id": duplicate.key},
+                    {
+                        "$inc": {"duplicate_count": 1},
+                        "$set": {"last_duplicate_at": contact_message.timestamp},
+                        "$push": {DUPLICATES_FIELD: {"$each": [sender], "$slice": -CONTACT_DEDUP_MAX_RECORDED}},
+                    }
+                )
+                return ContactMessageResponse(
+                    success=True,
+                    message="Thank you for reaching out! I'll get back to you within 24 hours.",
+                    id=duplicate.key,
+                    timestamp=contact_message.timestamp
+                )
+
+        try:
+            if queued_ingestion_enabled():
+                # Hand off to the write-behind worker, shedding load when it is saturated
+                if not contact_ingestion.enqueue(contact_message.dict()):
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Service is busy. Please try again shortly.",
+                        headers={"Retry-After": "5"}
+                    )
+                logger.info(f"Contact message queued: {contact_message.id}")
+            else:
+                # Save to database
+                document = contact_message.dict()
+                result = await db.contact_messages.insert_one(document)
+
+                if not result.inserted_id:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Failed to save contact message"
+                    )
+                await increment_contact_count(db)
+                logger.info(f"Contact message saved: {contact_message.id}")
+                # Delivery happens in the notification worker, off the request path
+                await enqueue_notifications(db, [document])
+        except Exception:
+            # Let a retry through if this submission was never stored
+            contact_dedup.discard(contact_message.id)
+            raise
+
+        # Return success response
+        return ContactMessageResponse(
+            success=True,
+            message="Thank you for reaching out! I'll get back to you within 24 hours.",
+            id=contact_message.id,
+            timestamp=contact_message.timestamp
+        )
             
     except HTTPException:
         raise
@@ -84,17 +192,14 @@ async def submit_contact_form(
         )
 
 @router.get("/stats", response_model=PortfolioStats)
+@cache_response(ttl=5, stale_ttl=30, tags=(STATS_CACHE_TAG,))
 async def get_portfolio_stats(db: AsyncIOMotorClient = Depends(get_database)):
     """
     Get portfolio statistics
     """
     try:
-        # Count total contact messages
-        total_contacts = await db.contact_messages.count_documents({})
-        
-        return PortfolioStats(
-            total_contacts=total_contacts
-        )
+        # Served from the cached counters document, already encoded
+        return PreEncodedJSONResponse(await stats_cache.get_encoded(db))
         
     except Exception as e:
         logger.error(f"Error getting portfolio stats: {str(e)}")
@@ -103,37 +208,163 @@ async def get_portfolio_stats(db: AsyncIOMotorClient = Depends(get_database)):
             detail="Failed to get portfolio statistics"
         )
 
-@router.get("/admin/contacts")
+@admin_router.get("/stats", response_model=AdminPortfolioStats)
+async def get_admin_stats(db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Get portfolio statistics with per-status message counts (admin endpoint)
+    """
+    try:
+        return AdminPortfolioStats(**await stats_cache.get(db))
+
+    except Exception as e:
+        logger.error(f"Error getting admin stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get portfolio statistics"
+        )
+
+@admin_router.get("/contacts")
 async def get_contact_messages(
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    view: Literal["summary", "full"] = "summary",
+    status: Optional[ContactStatus] = None,
+    email: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """
-    Get all contact messages (admin endpoint)
+    Get contact messages (admin endpoint)
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page;
+    ``skip`` is still honoured for offset paging when no cursor is given.
+    The default ``summary`` view returns a truncated ``preview`` instead of
+    the message body; ``view=full`` returns whole documents.
+
+    ``status``, ``email`` and ``date_from``/``date_to`` narrow the listing.
+    ``q`` runs a full-text search over subject, name and message; results
+    are then ranked by relevance (returned as ``score``) and ``next_cursor``
+    continues in that order.
     """
     try:
-        # Get total count
-        total = await db.contact_messages.count_documents({})
-        
-        # Get messages with pagination
-        cursor = db.contact_messages.find({}).sort("timestamp", -1).skip(skip).limit(limit)
-        messages = await cursor.to_list(length=limit)
-        
-        # Convert ObjectId to string for JSON serialization
-        for message in messages:
-            message['_id'] = str(message['_id'])
-        
-        return {
+        filters = contact_filters(status, email, date_from, date_to)
+        if q:
+            filters["$text"] = {"$search": q}
+
+        try:
+            after = ranked_keyset_filter(cursor) if q else keyset_filter(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor"
+            )
+
+        projection = CONTACT_SUMMARY_PROJECTION
+        if q:
+            # The text score only exists after $text has matched, so the
+            # cursor is applied once it has been added to each document
+            pipeline = [{"$match": filters}, {"$addFields": {SCORE_FIELD: {"$meta": "textScore"}}}]
+            if after:
+                pipeline.append({"$match": after})
+            pipeline.append({"$sort": RANKED_SORT})
+            projection = dict(CONTACT_SUMMARY_PROJECTION, **{SCORE_FIELD: 1})
+        else:
+            # Keyset pagination on (timestamp, id) stays flat regardless of depth
+            pipeline = [{"$match": dict(filters, **after)}, {"$sort": dict(KEYSET_SORT)}]
+        if skip and not cursor:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit})
+        if view == "summary":
+            # Truncate on the server so full bodies never leave Mongo
+            pipeline.append({"$project": projection})
+        messages = await db.contact_messages.aggregate(pipeline).to_list(length=limit)
+
+        total = None
+        if include_total:
+            if filters:
+                total = await db.contact_messages.count_documents(filters)
+            else:
+                # Unfiltered totals come from the cached counters rather than a collection scan
+                total = (await stats_cache.get(db))["total_contacts"]
+
+        # ObjectId and datetime values are encoded by orjson directly
+        return FastJSONResponse({
             "messages": messages,
             "total": total,
             "skip": skip,
-            "limit": limit
-        }
-        
+            "limit": limit,
+            "next_cursor": next_cursor(messages, limit, ranked=bool(q))
+        })
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting contact messages: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Failed to get contact messages"
-        )
\ No newline at end of file
+        )
+
+@admin_router.get("/contacts/{contact_id}")
+async def get_contact_message(contact_id: str, db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Get a single contact message with its full body (admin endpoint)
+    """
+    try:
+        message = await db.contact_messages.find_one({"id": contact_id}, {"_id": 0})
+    except Exception as e:
+        logger.error(f"Error getting contact message {contact_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get contact message"
+        )
+
+    if message is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Contact message not found"
+        )
+    return FastJSONResponse(message)
+
+@admin_router.patch("/contacts/status", response_model=ContactStatusTransitionResponse)
+async def transition_contact_status(transition: ContactStatusTransition, db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Move many contact messages from one status to another (admin endpoint)
+
+    Only messages currently in ``from_status`` are changed, so messages
+    another admin has already moved are skipped rather than overwritten.
+    The per-status counters are adjusted by the number actually modified.
+    """
+    if (transition.from_status, transition.to_status) not in CONTACT_STATUS_TRANSITIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot move messages from {transition.from_status} to {transition.to_status}"
+        )
+
+    ids = list(dict.fromkeys(transition.ids))
+    try:
+        # The status precondition makes the update optimistic: one round trip, no read first
+        result = await db.contact_messages.update_many(
+            {"id": {"$in": ids}, "status": transition.from_status},
+            {"$set": {"status": transition.to_status}}
+        )
+    except Exception as e:
+        logger.error(f"Error updating contact message status: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to update contact messages"
+        )
+
+    modified = result.modified_count
+    await adjust_contact_counts(db, by_status={transition.from_status: -modified, transition.to_status: modified})
+    return ContactStatusTransitionResponse(
+        from_status=transition.from_status,
+        to_status=transition.to_status,
+        requested=len(ids),
+        modified=modified,
+        skipped=len(ids) - modified
+    )
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, Request
+from utils.content import PORTFOLIO_CONTENT_CACHE_CONTROL, portfolio_content
+from utils.static_cache import asset_response
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def content_response(request: Request, key: str, not_found: str):
+    """
+    Serve a pre-encoded content resource, answering conditional requests with 304
+    """
+    if portfolio_content.snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Portfolio content is unavailable"
+        )
+    document = portfolio_content.get(key)
+    if document is None:
+        raise HTTPException(
+            status_code=404,
+            detail=not_found
+        )
+    return asset_response(request, document, PORTFOLIO_CONTENT_CACHE_CONTROL)
+
+@router.get("/projects")
+async def get_projects(request: Request):
+    """
+    List portfolio projects
+    """
+    return content_response(request, "projects", "Projects not found")
+
+@router.get("/projects/{project_id}")
+async def get_project(project_id: str, request: Request):
+    """
+    Get a single portfolio project
+    """
+    return content_response(request, f"projects/{project_id}", "Project not found")
+
+@router.get("/experience")
+async def get_experience(request: Request):
+    """
+    List work experience
+    """
+    return content_response(request, "experience", "Experience not found")
+
+@router.get("/skills")
+async def get_skills(request: Request):
+    """
+    List skills by category
+    """
+    return content_response(request, "skills", "Skills not found")
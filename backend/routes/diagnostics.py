@@ -0,0 +1,67 @@
+from fastapi import APIRouter, HTTPException, Depends
+from motor.motor_asyncio import AsyncIOMotorClient
+from utils.indexes import index_diagnostics
+from utils.static_cache import static_cache
+from utils.response_cache import response_cache
+from utils.database import database_metrics, get_database
+from utils.notifications import DEAD_LETTER_COLLECTION, OUTBOX_COLLECTION, notification_worker
+import logging
+
+# Mounted under /api/admin behind require_admin by the app factory
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/indexes")
+async def get_index_diagnostics(db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Report missing, unused and undeclared indexes (admin endpoint)
+    """
+    try:
+        return await index_diagnostics(db)
+
+    except Exception as e:
+        logger.error(f"Error getting index diagnostics: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get index diagnostics"
+        )
+
+@router.get("/static-cache")
+async def get_static_cache_stats():
+    """
+    Static asset cache size and per-asset hit/miss counters (admin endpoint)
+    """
+    return static_cache.stats()
+
+@router.get("/response-cache")
+async def get_response_cache_stats():
+    """
+    Response cache size and entries per invalidation tag (admin endpoint)
+    """
+    return response_cache.stats()
+
+@router.get("/metrics/mongo")
+async def get_mongo_metrics():
+    """
+    MongoDB connection pool and command statistics (admin endpoint)
+    """
+    return database_metrics()
+
+@router.get("/notifications")
+async def get_notification_stats(db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Notification worker counters and outbox backlog (admin endpoint)
+    """
+    try:
+        return dict(
+            notification_worker.stats(),
+            pending=await db[OUTBOX_COLLECTION].estimated_document_count(),
+            dead_letters=await db[DEAD_LETTER_COLLECTION].estimated_document_count()
+        )
+
+    except Exception as e:
+        logger.error(f"Error getting notification stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get notification stats"
+        )
@@ -1,34 +1,101 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import FileResponse
+from utils.http_cache import RangeNotSatisfiable, http_date, is_not_modified, make_etag, parse_range, range_applies
+from utils.static_cache import asset_response, static_cache
 import os
 import logging
 from pathlib import Path
+from typing import NamedTuple, Optional
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Resume file path
 RESUME_FILE_PATH = Path(__file__).parent.parent / "static" / "Siddharth_Singh_Resume.pdf"
+RESUME_FILENAME = "Siddharth_Singh_Resume.pdf"
+RESUME_ASSET_PATH = RESUME_FILENAME
+RESUME_CACHE_CONTROL = f"public, max-age={int(os.environ.get('RESUME_CACHE_MAX_AGE', '86400'))}"
+
+class ResumeFileInfo(NamedTuple):
+    mtime_ns: int
+    size: int
+    etag: str
+    last_modified: float
+
+_resume_info: Optional[ResumeFileInfo] = None
+
+def get_resume_info() -> ResumeFileInfo:
+    """
+    Validators for the resume file, recomputed only when its mtime or size changes
+    """
+    global _resume_info
+    try:
+        stat = RESUME_FILE_PATH.stat()
+    except FileNotFoundError:
+        # Create a placeholder PDF if it doesn't exist
+        create_placeholder_resume()
+        stat = RESUME_FILE_PATH.stat()
+
+    info = _resume_info
+    if info is None or info.mtime_ns != stat.st_mtime_ns or info.size != stat.st_size:
+        info = ResumeFileInfo(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            etag=make_etag(RESUME_FILE_PATH.read_bytes()),
+            last_modified=stat.st_mtime,
+        )
+        _resume_info = info
+    return info
 
 @router.get("/resume/download")
-async def download_resume():
+async def download_resume(request: Request):
     """
     Download resume PDF file
+
+    Served from the in-memory static asset cache when possible. Supports
+    conditional requests (If-None-Match / If-Modified-Since) and single
+    byte ranges.
     """
     try:
-        # Check if resume file exists
-        if not RESUME_FILE_PATH.exists():
-            # Create a placeholder PDF if it doesn't exist
-            create_placeholder_resume()
-        
+        asset = static_cache.get(RESUME_ASSET_PATH)
+        if asset is not None:
+            return asset_response(request, asset, RESUME_CACHE_CONTROL, filename=RESUME_FILENAME)
+
+        # Not cached (missing at startup or over the memory cap): serve from disk
+        info = get_resume_info()
+        headers = {
+            "ETag": info.etag,
+            "Last-Modified": http_date(info.last_modified),
+            "Cache-Control": RESUME_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+        }
+
+        if is_not_modified(request.headers, info.etag, info.last_modified):
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        if range_applies(request.headers, info.etag):
+            try:
+                byte_range = parse_range(request.headers.get("range"), info.size)
+            except RangeNotSatisfiable:
+                headers["Content-Range"] = f"bytes */{info.size}"
+                return Response(status_code=416, headers=headers)
+
+        headers["Content-Disposition"] = f"attachment; filename={RESUME_FILENAME}"
+
+        if byte_range is not None:
+            start, end = byte_range
+            with open(RESUME_FILE_PATH, "rb") as f:
+                f.seek(start)
+                content = f.read(end - start + 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+            return Response(content=content, status_code=206, media_type="application/pdf", headers=headers)
+
         # Return file response
         return FileResponse(
             path=RESUME_FILE_PATH,
-            filename="Siddharth_Singh_Resume.pdf",
             media_type="application/pdf",
-            headers={
-                "Content-Disposition": "attachment; filename=Siddharth_Singh_Resume.pdf"
-            }
+            headers=headers
         )
         
     except Exception as e:
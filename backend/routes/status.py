@@ -0,0 +1,162 @@
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from models.status import StatusCheck, StatusCheckCreate, StatusCheckBatchItemResult, StatusCheckBatchResponse
+from utils.database import get_database
+from utils.pagination import KEYSET_SORT, keyset_filter, next_cursor
+from utils.serialization import FastJSONResponse, dumps
+from utils.response_cache import cache_response, response_cache
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from typing import Any, AsyncIterator, Dict, List, Optional
+import logging
+import orjson
+import os
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Only the fields StatusCheck exposes are read from Mongo
+STATUS_PROJECTION = {"_id": 0, "id": 1, "client_name": 1, "timestamp": 1}
+# Matches the 1000 items the listing returned before it was paginated
+STATUS_PAGE_SIZE = 1000
+STATUS_MAX_PAGE_SIZE = 1000
+STATUS_STREAM_BATCH_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STATUS_BATCH_MAX_ITEMS = int(os.environ.get("STATUS_BATCH_MAX_ITEMS", "1000"))
+# Cached status listings are dropped when status checks are written
+STATUS_CACHE_TAG = "status"
+
+@router.post("/status", response_model=StatusCheck)
+async def create_status_check(input: StatusCheckCreate, db: AsyncIOMotorClient = Depends(get_database)):
+    status_dict = input.dict()
+    status_obj = StatusCheck(**status_dict)
+    _ = await db.status_checks.insert_one(status_obj.dict())
+    response_cache.invalidate(STATUS_CACHE_TAG)
+    return status_obj
+
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """
+    Decode a batch body given either as a JSON array or as NDJSON
+    Raises ValueError if the body is neither
+    """
+    if NDJSON_MEDIA_TYPE in content_type:
+        return [orjson.loads(line) for line in body.splitlines() if line.strip()]
+
+    items = orjson.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array")
+    return items
+
+@router.post("/status/batch", response_model=StatusCheckBatchResponse)
+async def create_status_checks_batch(request: Request, db: AsyncIOMotorClient = Depends(get_database)):
+    """
+    Create many status checks with one unordered insert_many
+
+    Accepts a JSON array or an NDJSON body of StatusCheckCreate items and
+    reports a result per item, in input order.
+    """
+    try:
+        items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid batch body: {str(e)}"
+        )
+
+    if len(items) > STATUS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {STATUS_BATCH_MAX_ITEMS} items"
+        )
+
+    # Validate everything first; only valid items are written
+    results: List[StatusCheckBatchItemResult] = []
+    documents: List[Dict[str, Any]] = []
+    positions: List[int] = []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise TypeError("Item must be an object")
+            status_obj = StatusCheck(**StatusCheckCreate(**item).dict())
+        except (ValidationError, TypeError) as e:
+            results.append(StatusCheckBatchItemResult(index=index, success=False, error=str(e)))
+            continue
+        results.append(StatusCheckBatchItemResult(index=index, success=True, id=status_obj.id))
+        documents.append(status_obj.dict())
+        positions.append(len(results) - 1)
+
+    if documents:
+        try:
+            await db.status_checks.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                result = results[positions[error["index"]]]
+                result.success = False
+                result.id = None
+                result.error = error.get("errmsg", "Write failed")
+        except Exception as e:
+            logger.error(f"Error inserting status check batch: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to save status checks"
+            )
+
+    inserted = sum(1 for result in results if result.success)
+    if inserted:
+        response_cache.invalidate(STATUS_CACHE_TAG)
+    return StatusCheckBatchResponse(
+        inserted=inserted,
+        failed=len(results) - inserted,
+        results=results
+    )
+
+async def stream_status_checks(cursor) -> AsyncIterator[bytes]:
+    """
+    Yield status checks as NDJSON lines straight from the Mongo cursor
+    """
+    async for doc in cursor:
+        yield dumps(doc) + b"\n"
+
+@router.get("/status")
+@cache_response(ttl=2, stale_ttl=10, tags=(STATUS_CACHE_TAG,))
+async def get_status_checks(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=STATUS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: Optional[str] = None,
+    db: AsyncIOMotorClient = Depends(get_database)
+):
+    """
+    List status checks, newest first
+
+    Returns a page of at most ``limit`` items with the next page's cursor
+    in the ``X-Next-Cursor`` header. With ``format=ndjson`` or
+    ``Accept: application/x-ndjson`` results are streamed instead, without
+    a default limit.
+    """
+    try:
+        query = keyset_filter(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor"
+        )
+
+    find = db.status_checks.find(query, STATUS_PROJECTION).sort(KEYSET_SORT)
+
+    if format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        if limit:
+            find = find.limit(limit)
+        return StreamingResponse(
+            stream_status_checks(find.batch_size(STATUS_STREAM_BATCH_SIZE)),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    limit = limit or STATUS_PAGE_SIZE
+    status_checks = await find.limit(limit).to_list(length=limit)
+    headers = {}
+    cursor_after = next_cursor(status_checks, limit)
+    if cursor_after:
+        headers["X-Next-Cursor"] = cursor_after
+    return FastJSONResponse(status_checks, headers=headers)
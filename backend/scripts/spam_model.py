@@ -0,0 +1,70 @@
+"""
+Train the spam model from labeled contact messages and rescore the inbox.
+
+Label examples by setting ``spam_label`` (true/false) on contact messages,
+then, from the backend directory:
+
+    python -m scripts.spam_model train --output spam_model.npz
+    python -m scripts.spam_model rescore --model spam_model.npz
+
+Point SPAM_MODEL_FILE at the trained file to have the API use it.
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / '.env')
+
+from utils.database import create_mongo_client
+from utils.spam_model import (
+    DEFAULT_FEATURE_BITS, SPAM_RESCORE_CHUNK_SIZE, SpamModel,
+    load_training_data, rescore_contact_messages, train_spam_model
+)
+
+
+async def train(args):
+    client = create_mongo_client(os.environ['MONGO_URL'])
+    try:
+        texts, labels = await load_training_data(client[os.environ['DB_NAME']])
+    finally:
+        client.close()
+
+    model = train_spam_model(texts, labels, feature_bits=args.feature_bits, alpha=args.alpha)
+    model.save(args.output)
+    spam = sum(labels)
+    print(f"trained on {len(labels)} messages ({spam} spam, {len(labels) - spam} legitimate), saved to {args.output}")
+
+
+async def rescore(args):
+    model = SpamModel.load(args.model)
+    client = create_mongo_client(os.environ['MONGO_URL'])
+    try:
+        scored = await rescore_contact_messages(client[os.environ['DB_NAME']], model, args.chunk_size)
+    finally:
+        client.close()
+    print(f"rescored {scored} contact messages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Fit a model on messages with a spam_label")
+    train_parser.add_argument("--output", default="spam_model.npz")
+    train_parser.add_argument("--feature-bits", type=int, default=DEFAULT_FEATURE_BITS)
+    train_parser.add_argument("--alpha", type=float, default=1.0, help="Additive smoothing")
+
+    rescore_parser = commands.add_parser("rescore", help="Write spam_score on every contact message")
+    rescore_parser.add_argument("--model", required=True)
+    rescore_parser.add_argument("--chunk-size", type=int, default=SPAM_RESCORE_CHUNK_SIZE)
+
+    args = parser.parse_args()
+    asyncio.run(train(args) if args.command == "train" else rescore(args))
+
+
+if __name__ == "__main__":
+    main()
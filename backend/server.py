@@ -1,74 +1,37 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
 from typing import List
-import uuid
-from datetime import datetime
-
-# Import route modules
-from routes.contact import router as contact_router
-from routes.resume import router as resume_router
+import asyncio
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-# Create the main app without a prefix
-app = FastAPI(title="Siddharth Singh Portfolio API", version="1.0.0")
-
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
-
-
-# Define Models
-class StatusCheck(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-class StatusCheckCreate(BaseModel):
-    client_name: str
-
-# Add your routes to the router instead of directly to app
-@api_router.get("/")
-async def root():
-    return {"message": "Siddharth Singh Portfolio API - Backend is running!"}
-
-@api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
-    status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
-
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
-
-# Include route modules
-api_router.include_router(contact_router, tags=["contact"])
-api_router.include_router(resume_router, tags=["resume"])
-
-# Include the router in the main app
-app.include_router(api_router)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Import route modules
+from routes.contact import admin_router as contact_admin_router, router as contact_router
+from routes.resume import router as resume_router
+from routes.status import router as status_router
+from routes.assets import router as assets_router
+from routes.diagnostics import router as diagnostics_router
+from routes.content import router as content_router
+from utils.rate_limiter import get_memory_limiter, init_rate_limiter
+from utils.ingestion import contact_ingestion, queued_ingestion_enabled
+from utils.counters import run_counter_reconciliation
+from utils.indexes import ensure_indexes
+from utils.notifications import notification_worker
+from utils.retention import retention_enabled, run_contact_retention
+from utils.static_cache import static_cache
+from utils.content import portfolio_content
+from utils.database import create_mongo_client, warm_up_pool
+from utils.auth import require_admin
+from utils.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, registry
+from utils.serialization import FastJSONResponse, PreEncodedJSONResponse, dumps
+from utils.response_cache import ResponseCacheMiddleware, cache_response
 
 # Configure logging
 logging.basicConfig(
@@ -77,6 +40,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+# The health message never changes, so it is encoded once
+ROOT_PAYLOAD = dumps({"message": "Siddharth Singh Portfolio API - Backend is running!"})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Own the MongoDB client and background workers for the app's lifetime
+    """
+    # MongoDB connection
+    owns_client = app.state.mongo_client is None
+    client = create_mongo_client(os.environ['MONGO_URL']) if owns_client else app.state.mongo_client
+    db = client[os.environ['DB_NAME']]
+    app.state.mongo_client = client
+    app.state.db = db
+
+    if os.environ.get("MONGO_WARMUP", "true").lower() in ("1", "true", "yes"):
+        await warm_up_pool(client)
+    await ensure_indexes(db)
+    await init_rate_limiter(db)
+    if queued_ingestion_enabled():
+        contact_ingestion.start(db)
+    notification_worker.start(db)
+
+    # Long-running maintenance tasks started with the app
+    background_tasks: List[asyncio.Task] = [
+        asyncio.create_task(run_counter_reconciliation(db)),
+    ]
+    await asyncio.to_thread(static_cache.refresh)
+    background_tasks.append(asyncio.create_task(static_cache.run_polling()))
+    await portfolio_content.reload()
+    background_tasks.append(asyncio.create_task(portfolio_content.run_polling()))
+    if retention_enabled():
+        background_tasks.append(asyncio.create_task(run_contact_retention(db)))
+
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+
+        # Flush queued contact messages before the client goes away
+        await contact_ingestion.drain()
+        await notification_worker.stop()
+        # Pending write-through rate limit hits would otherwise be lost
+        await get_memory_limiter().flush()
+        if owns_client:
+            client.close()
+            app.state.mongo_client = None
+
+
+def create_app(mongo_client=None) -> FastAPI:
+    """
+    Build the API application
+
+    ``mongo_client`` lets callers (benchmarks, tests) supply their own
+    client; otherwise one is created from MONGO_URL when the app starts.
+    """
+    # Create the main app without a prefix
+    app = FastAPI(
+        title="Siddharth Singh Portfolio API",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse
+    )
+    app.state.mongo_client = mongo_client
+
+    # Create a router with the /api prefix
+    api_router = APIRouter(prefix="/api")
+
+    # Add your routes to the router instead of directly to app
+    @api_router.get("/")
+    @cache_response(ttl=3600)
+    async def root():
+        return PreEncodedJSONResponse(ROOT_PAYLOAD)
+
+    # Include route modules
+    api_router.include_router(contact_router, tags=["contact"])
+    api_router.include_router(resume_router, tags=["resume"])
+    api_router.include_router(status_router, tags=["status"])
+    api_router.include_router(assets_router, tags=["static"])
+    api_router.include_router(content_router, tags=["content"])
+
+    # Everything under /api/admin shares one access policy
+    admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+    admin_router.include_router(contact_admin_router, tags=["admin"])
+    admin_router.include_router(diagnostics_router, tags=["diagnostics"])
+    api_router.include_router(admin_router)
+
+    # Include the router in the main app
+    app.include_router(api_router)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+    # Added first so it sits inside CORS: per-origin headers are never cached
+    app.add_middleware(ResponseCacheMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(MetricsMiddleware)
+
+    return app
+
+
+app = create_app()
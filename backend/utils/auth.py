@@ -0,0 +1,29 @@
+from fastapi import Header, HTTPException
+from typing import Optional
+import hmac
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Shared secret for every /api/admin endpoint; unset disables them
+ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN", "")
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Dependency rejecting requests without the admin token in ``X-Admin-Token``
+
+    Fails closed: with no ADMIN_API_TOKEN configured every request is refused.
+    """
+    if not ADMIN_API_TOKEN:
+        logger.error("Admin request refused: ADMIN_API_TOKEN is not configured")
+        raise HTTPException(
+            status_code=503,
+            detail="Admin access is not configured"
+        )
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token"
+        )
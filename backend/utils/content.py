@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional
+from models.content import PortfolioContent
+from utils.http_cache import make_etag
+from utils.serialization import JSON_MEDIA_TYPE, dumps
+from utils.static_cache import StaticAsset, asset_from_bytes
+import asyncio
+import logging
+import orjson
+import os
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIO_CONTENT_FILE = Path(os.environ.get("PORTFOLIO_CONTENT_FILE", str(Path(__file__).parent.parent / "data" / "portfolio.json")))
+PORTFOLIO_CONTENT_POLL_SECONDS = float(os.environ.get("PORTFOLIO_CONTENT_POLL_SECONDS", "5"))
+PORTFOLIO_CONTENT_CACHE_CONTROL = f"public, max-age={int(os.environ.get('PORTFOLIO_CONTENT_MAX_AGE', '300'))}"
+
+# Recorded in place of an mtime while the file is missing, so that is logged once
+_MISSING = -1
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+    """
+    One loaded version of the content file, encoded per API resource
+    """
+
+    version: str
+    mtime_ns: int
+    # "projects", "projects/<id>", "experience", "skills"
+    documents: Mapping[str, StaticAsset]
+    total_projects: int
+    # Distinct names across project and experience technologies and skills
+    technologies: int
+
+
+def build_snapshot(raw: bytes, last_modified: float, mtime_ns: int) -> ContentSnapshot:
+    """
+    Validate the content file and pre-serialize every resource it serves
+    Raises ValueError (including pydantic's ValidationError) on invalid content.
+    """
+    content = PortfolioContent(**orjson.loads(raw))
+    resources = {
+        "projects": [project.model_dump() for project in content.projects],
+        "experience": [entry.model_dump() for entry in content.experience],
+        "skills": [category.model_dump() for category in content.skills],
+    }
+    for project in resources["projects"]:
+        resources[f"projects/{project['id']}"] = project
+
+    documents = {
+        key: asset_from_bytes(key, dumps(value), JSON_MEDIA_TYPE, last_modified, mtime_ns)
+        for key, value in resources.items()
+    }
+    technologies = {name for project in content.projects for name in project.technologies}
+    technologies.update(name for entry in content.experience for name in entry.technologies)
+    technologies.update(skill.name for category in content.skills for skill in category.skills)
+    return ContentSnapshot(
+        version=make_etag(raw).strip('"'),
+        mtime_ns=mtime_ns,
+        documents=MappingProxyType(documents),
+        total_projects=len(content.projects),
+        technologies=len(technologies),
+    )
+
+
+class ContentStore:
+    """
+    Portfolio content served from memory as pre-encoded JSON
+
+    The data file is loaded and validated once, and each resource is
+    encoded with its ETag and compressed variants up front. A polling task
+    re-stats the file and builds a new snapshot when it changes; the
+    snapshot is swapped in with one assignment, so a request always reads
+    a single consistent version. An invalid file is logged and the
+    current snapshot kept.
+    """
+
+    def __init__(self, path: Path = PORTFOLIO_CONTENT_FILE, poll_interval: float = PORTFOLIO_CONTENT_POLL_SECONDS):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._seen_mtime_ns: Optional[int] = None
+        # Called on the event loop after a new snapshot is swapped in
+        self.listeners: List[Callable[[], None]] = []
+
+    @property
+    def snapshot(self) -> Optional[ContentSnapshot]:
+        return self._snapshot
+
+    @property
+    def total_projects(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.total_projects if snapshot is not None else 0
+
+    @property
+    def technologies(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.technologies if snapshot is not None else 0
+
+    def refresh(self) -> bool:
+        """
+        Reload the content file if it changed; returns True if a new snapshot was swapped in
+        """
+        try:
+            stat = self.path.stat()
+        except OSError as e:
+            if self._seen_mtime_ns != _MISSING:
+                logger.error(f"Portfolio content file {self.path} unavailable: {str(e)}")
+            self._seen_mtime_ns = _MISSING
+            return False
+        if stat.st_mtime_ns == self._seen_mtime_ns:
+            return False
+        # Remembered even if loading fails, so a broken file is reported once
+        self._seen_mtime_ns = stat.st_mtime_ns
+
+        try:
+            snapshot = build_snapshot(self.path.read_bytes(), stat.st_mtime, stat.st_mtime_ns)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading portfolio content from {self.path}: {str(e)}")
+            return False
+
+        current = self._snapshot
+        if current is not None and current.version == snapshot.version:
+            return False
+        self._snapshot = snapshot
+        logger.info(f"Loaded portfolio content version {snapshot.version[:12]} ({snapshot.total_projects} projects)")
+        return True
+
+    async def reload(self) -> bool:
+        """
+        Run ``refresh`` off the event loop, then notify listeners on it
+        """
+        changed = await asyncio.to_thread(self.refresh)
+        if changed:
+            for listener in self.listeners:
+                listener()
+        return changed
+
+    def get(self, key: str) -> Optional[StaticAsset]:
+        snapshot = self._snapshot
+        return snapshot.documents.get(key) if snapshot is not None else None
+
+    async def run_polling(self):
+        """
+        Reload the content file when it changes, checking every ``poll_interval`` seconds
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Error refreshing portfolio content: {str(e)}")
+
+
+portfolio_content = ContentStore()
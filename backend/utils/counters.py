@@ -0,0 +1,173 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Dict, Mapping, Optional
+import asyncio
+import logging
+import os
+import time
+
+from utils.content import portfolio_content
+from utils.response_cache import response_cache
+from utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "counters"
+STATS_COUNTER_ID = "portfolio_stats"
+STATS_CACHE_TTL_SECONDS = float(os.environ.get("STATS_CACHE_TTL_SECONDS", "30"))
+STATS_RECONCILE_INTERVAL_SECONDS = float(os.environ.get("STATS_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+# Portfolio facts that are not derived from data; total_projects and
+# technologies come from the portfolio content file
+PORTFOLIO_FACTS = {
+    "years_experience": 3,
+}
+
+# Per-status message counts are kept under this field of the counters document
+STATUS_COUNTS_FIELD = "status_counts"
+CONTACT_STATUSES = ("new", "read", "replied")
+
+# Cached /api/stats responses are dropped whenever the stats change
+STATS_CACHE_TAG = "stats"
+
+# Fields served by GET /api/stats, in response order; per-status counts
+# are admin-only (GET /api/admin/stats)
+PUBLIC_STATS_FIELDS = ("total_projects", "total_contacts", "technologies", "years_experience")
+
+
+class StatsCache:
+    """
+    In-process TTL cache in front of the counters document
+    """
+
+    def __init__(self, ttl_seconds: float = STATS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[Dict[str, Any]] = None
+        self._encoded: Optional[bytes] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._expires_at = 0.0
+        response_cache.invalidate(STATS_CACHE_TAG)
+
+    def bump(self, field: str, amount: int = 1):
+        """
+        Apply an increment locally so the cached value stays current between reloads
+        Dotted fields (``status_counts.new``) address nested counters.
+        """
+        if self._value is not None:
+            *parents, leaf = field.split(".")
+            target = self._value
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = target.get(leaf, 0) + amount
+            self._encoded = None
+        response_cache.invalidate(STATS_CACHE_TAG)
+
+    async def get(self, db: AsyncIOMotorClient) -> Dict[str, Any]:
+        if self._value is not None and time.monotonic() < self._expires_at:
+            return self._value
+
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            self._value = await load_stats(db)
+            self._encoded = None
+            self._expires_at = time.monotonic() + self.ttl_seconds
+            return self._value
+
+    async def get_encoded(self, db: AsyncIOMotorClient) -> bytes:
+        """
+        Public stats pre-serialized to JSON, re-encoded only when the value changes
+        """
+        value = await self.get(db)
+        encoded = self._encoded
+        if encoded is None:
+            encoded = dumps({field: value[field] for field in PUBLIC_STATS_FIELDS})
+            self._encoded = encoded
+        return encoded
+
+
+stats_cache = StatsCache()
+# A new content version can change the project and technology counts
+portfolio_content.listeners.append(stats_cache.invalidate)
+
+
+async def load_stats(db: AsyncIOMotorClient) -> Dict[str, Any]:
+    """
+    Read the counters document, reconciling it first if it does not exist yet
+    """
+    doc = await db[COUNTERS_COLLECTION].find_one({"_id": STATS_COUNTER_ID})
+    if doc is None or STATUS_COUNTS_FIELD not in doc:
+        # Missing, or written before per-status counts were tracked
+        doc = await reconcile_counters(db)
+
+    stats = dict(PORTFOLIO_FACTS)
+    stats.update({key: value for key, value in doc.items() if key != "_id"})
+    # Counters documents written before these were derived still carry them
+    stats["total_projects"] = portfolio_content.total_projects
+    stats["technologies"] = portfolio_content.technologies
+    return stats
+
+
+async def adjust_contact_counts(db: AsyncIOMotorClient, total: int = 0, by_status: Optional[Mapping[str, int]] = None):
+    """
+    Apply changes to the total and per-status contact counts in one atomic $inc
+    """
+    increments = {f"{STATUS_COUNTS_FIELD}.{status}": amount for status, amount in (by_status or {}).items() if amount}
+    if total:
+        increments["total_contacts"] = total
+    if not increments:
+        return
+    try:
+        await db[COUNTERS_COLLECTION].update_one(
+            {"_id": STATS_COUNTER_ID},
+            {"$inc": increments},
+            upsert=True
+        )
+        for field, amount in increments.items():
+            stats_cache.bump(field, amount)
+    except Exception as e:
+        logger.error(f"Error adjusting contact counters: {str(e)}")
+
+
+async def increment_contact_count(db: AsyncIOMotorClient, amount: int = 1):
+    """
+    Count newly stored contact messages, which always start out as ``new``
+    """
+    await adjust_contact_counts(db, amount, {"new": amount})
+
+
+async def reconcile_counters(db: AsyncIOMotorClient) -> Dict[str, Any]:
+    """
+    Recount contact messages and rewrite the counters document
+    """
+    grouped = await db.contact_messages.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    status_counts = {status: 0 for status in CONTACT_STATUSES}
+    status_counts.update({group["_id"]: group["count"] for group in grouped if group["_id"] is not None})
+    total_contacts = sum(group["count"] for group in grouped)
+    doc = dict(PORTFOLIO_FACTS, total_contacts=total_contacts, **{STATUS_COUNTS_FIELD: status_counts})
+
+    await db[COUNTERS_COLLECTION].update_one(
+        {"_id": STATS_COUNTER_ID},
+        {"$set": doc},
+        upsert=True
+    )
+    stats_cache.invalidate()
+    logger.info(f"Reconciled portfolio counters: {total_contacts} contact messages")
+    return doc
+
+
+async def run_counter_reconciliation(db: AsyncIOMotorClient, interval: float = STATS_RECONCILE_INTERVAL_SECONDS):
+    """
+    Periodically reconcile the counters document against the real count
+    """
+    while True:
+        try:
+            await reconcile_counters(db)
+        except Exception as e:
+            logger.error(f"Error reconciling portfolio counters: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,208 @@
+from fastapi import Request
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from typing import Any, Dict
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from utils.metrics import MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES, registry
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)))
+
+
+def mongo_client_options() -> Dict[str, Any]:
+    """
+    Pool sizing, timeouts and server selection settings from the environment
+    """
+    options = {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 100),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 5),
+        "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS", 300000),
+        "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 10000),
+        "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+        "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+    }
+    socket_timeout = os.environ.get("MONGO_SOCKET_TIMEOUT_MS")
+    if socket_timeout:
+        options["socketTimeoutMS"] = int(socket_timeout)
+    return options
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters fed by PyMongo's CMAP events
+
+    Events fire on Motor's executor threads, so checkout wait times are
+    paired per thread and all counters are updated under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.pools_created = 0
+        self.pools_cleared = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools_created += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        waited = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pools_created": self.pools_created,
+                "pools_cleared": self.pools_cleared,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "connections_open": self.connections_created - self.connections_closed,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "wait_time_avg_ms": self.wait_time_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_time_max_ms": self.wait_time_max * 1000,
+            }
+
+
+class CommandStatsListener(monitoring.CommandListener):
+    """
+    Per-command counts and durations fed by PyMongo's command monitoring
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, name: str, duration_micros: int, failed: bool):
+        MONGO_COMMAND_DURATION.observe(duration_micros / 1e6, name)
+        if failed:
+            MONGO_COMMAND_FAILURES.inc(name)
+        with self._lock:
+            stats = self.commands.setdefault(name, {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration_ms = duration_micros / 1000
+            stats["count"] += 1
+            stats["failures"] += int(failed)
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event.command_name, event.duration_micros, False)
+
+    def failed(self, event):
+        self._record(event.command_name, event.duration_micros, True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.commands.items()}
+
+
+pool_stats = PoolStatsListener()
+command_stats = CommandStatsListener()
+
+
+def _pool_samples():
+    snapshot = pool_stats.snapshot()
+    yield "mongo_pool_connections_open", "gauge", "Open pooled MongoDB connections", snapshot["connections_open"]
+    yield "mongo_pool_checked_out", "gauge", "MongoDB connections currently checked out", snapshot["checked_out"]
+    yield "mongo_pool_connections_created_total", "counter", "MongoDB connections created", snapshot["connections_created"]
+    yield "mongo_pool_checkout_failures_total", "counter", "Failed MongoDB connection checkouts", snapshot["checkout_failures"]
+    yield "mongo_pool_wait_seconds_max", "gauge", "Longest MongoDB connection checkout wait", snapshot["wait_time_max_ms"] / 1000
+
+
+registry.add_collector(_pool_samples)
+
+
+def create_mongo_client(mongo_url: str) -> AsyncIOMotorClient:
+    """
+    Build the Motor client with configured pool settings and monitoring listeners
+    """
+    return AsyncIOMotorClient(
+        mongo_url,
+        event_listeners=[pool_stats, command_stats],
+        **mongo_client_options()
+    )
+
+
+async def warm_up_pool(client: AsyncIOMotorClient, connections: int = None):
+    """
+    Open ``connections`` pooled connections up front with concurrent pings
+    """
+    if connections is None:
+        connections = max(1, mongo_client_options()["minPoolSize"])
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+        logger.info(f"Warmed MongoDB pool with {connections} connections in {(time.perf_counter() - started) * 1000:.1f}ms")
+    except Exception as e:
+        logger.error(f"Error warming MongoDB connection pool: {str(e)}")
+
+
+def get_database(request: Request):
+    """
+    Dependency returning the database opened by the app's lifespan
+    """
+    return request.app.state.db
+
+
+def database_metrics() -> Dict[str, Any]:
+    return {
+        "pool": pool_stats.snapshot(),
+        "commands": command_stats.snapshot(),
+        "options": mongo_client_options(),
+    }
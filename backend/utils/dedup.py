@@ -0,0 +1,199 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+import struct
+import time
+
+# "reject" refuses near-duplicates, "merge" folds them into the original
+# message, "off" disables the check.
+CONTACT_DEDUP_MODE = os.environ.get("CONTACT_DEDUP_MODE", "reject").lower()
+CONTACT_DEDUP_WINDOW_SECONDS = float(os.environ.get("CONTACT_DEDUP_WINDOW_SECONDS", "3600"))
+CONTACT_DEDUP_MAX_ENTRIES = int(os.environ.get("CONTACT_DEDUP_MAX_ENTRIES", "100000"))
+# Estimated Jaccard similarity of content words at which two messages are near-duplicates
+CONTACT_DEDUP_THRESHOLD = float(os.environ.get("CONTACT_DEDUP_THRESHOLD", "0.7"))
+# Messages with fewer content words match too easily, so they are not checked
+CONTACT_DEDUP_MIN_WORDS = int(os.environ.get("CONTACT_DEDUP_MIN_WORDS", "6"))
+# In merge mode the senders of merged duplicates are kept on the original
+# message under DUPLICATES_FIELD, newest last, up to this many
+CONTACT_DEDUP_MAX_RECORDED = int(os.environ.get("CONTACT_DEDUP_MAX_RECORDED", "20"))
+DUPLICATES_FIELD = "duplicates"
+
+# 8 bands of 4 rows: pairs at 0.7 similarity become candidates ~89% of the
+# time, at 0.85 over 99%, at 0.3 about 6% (and are then rejected on the
+# full signature)
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+MINHASH_PERMUTATIONS = MINHASH_BANDS * MINHASH_ROWS
+
+# One 64-byte blake2b digest per word supplies all 32 hash values (16 bits each)
+_UNPACK_HASHES = struct.Struct(f">{MINHASH_PERMUTATIONS}H").unpack
+_EMPTY_SIGNATURE = (0xFFFF,) * MINHASH_PERMUTATIONS
+
+_WORD_RE = re.compile(r"\w+")
+
+# Words common to almost every message; left in, they make unrelated
+# messages look similar
+STOPWORDS = frozenset("""
+a about all am an and any are as at be but by can could do for from have hello hi how i if in is it
+its just me my of on or our please so that the their there this to us was we what when will with
+would you your
+""".split())
+
+
+def words(text: str) -> List[str]:
+    """
+    Distinct content words of ``text`` in order of first appearance
+    """
+    return [word for word in dict.fromkeys(_WORD_RE.findall(text.lower())) if word not in STOPWORDS]
+
+
+def minhash(tokens: List[str]) -> Tuple[int, ...]:
+    """
+    MinHash signature of a word set
+
+    The fraction of positions two signatures share estimates the Jaccard
+    similarity of their word sets.
+    """
+    if not tokens:
+        return _EMPTY_SIGNATURE
+    rows = [_UNPACK_HASHES(blake2b(token.encode(), digest_size=64).digest()) for token in tokens]
+    # Column-wise minimum over the words, computed by min/zip in C
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class MinHashIndex:
+    """
+    Bounded, time-evicted index of recent signatures with banded LSH lookup
+
+    Each signature is split into bands of consecutive rows, each with its
+    own hash table; only entries that agree exactly on some band are
+    compared in full, so lookups stay cheap however many entries are held.
+    Entries are kept in insertion order, which is also expiry order, and
+    the oldest are dropped once ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CONTACT_DEDUP_MAX_ENTRIES,
+        window_seconds: float = CONTACT_DEDUP_WINDOW_SECONDS,
+        threshold: float = CONTACT_DEDUP_THRESHOLD,
+        bands: int = MINHASH_BANDS,
+        rows: int = MINHASH_ROWS,
+    ):
+        self.max_entries = max_entries
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self._slices = [slice(band * rows, (band + 1) * rows) for band in range(bands)]
+        # band rows -> {key: signature}, so candidates are compared without a second lookup
+        self._tables: List[Dict[Tuple[int, ...], Dict[str, Tuple[int, ...]]]] = [{} for _ in self._slices]
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str, signature: Tuple[int, ...]):
+        for table, band in zip(self._tables, self._slices):
+            band_key = signature[band]
+            bucket = table.get(band_key)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del table[band_key]
+
+    def evict_expired(self, now: Optional[float] = None):
+        cutoff = (now if now is not None else time.monotonic()) - self.window_seconds
+        while self._entries:
+            key, (signature, added_at) = next(iter(self._entries.items()))
+            if added_at >= cutoff:
+                break
+            self._entries.popitem(last=False)
+            self._remove(key, signature)
+
+    def most_similar(self, signature: Tuple[int, ...], now: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """
+        Most similar indexed entry at or above ``threshold``, as (key, similarity)
+        """
+        self.evict_expired(now)
+        best: Optional[Tuple[str, float]] = None
+        for table, band in zip(self._tables, self._slices):
+            bucket = table.get(signature[band])
+            if not bucket:
+                continue
+            for key, other in bucket.items():
+                score = similarity(signature, other)
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+
+    def add(self, key: str, signature: Tuple[int, ...], now: Optional[float] = None):
+        if key in self._entries:
+            self.discard(key)
+        while len(self._entries) >= self.max_entries:
+            oldest, (oldest_signature, _) = self._entries.popitem(last=False)
+            self._remove(oldest, oldest_signature)
+        self._entries[key] = (signature, now if now is not None else time.monotonic())
+        for table, band in zip(self._tables, self._slices):
+            table.setdefault(signature[band], {})[key] = signature
+
+    def discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._remove(key, entry[0])
+
+
+@dataclass
+class DuplicateMatch:
+    key: str
+    similarity: float
+
+
+class NearDuplicateDetector:
+    """
+    Flags contact submissions whose subject and message nearly match one
+    accepted within the window
+
+    Matching ignores the sender, so the same text sent from rotating
+    addresses is still caught.
+    """
+
+    def __init__(self, mode: str = CONTACT_DEDUP_MODE, min_words: int = CONTACT_DEDUP_MIN_WORDS, index: Optional[MinHashIndex] = None):
+        self.mode = mode
+        self.min_words = min_words
+        self.index = index or MinHashIndex()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("reject", "merge")
+
+    def check_and_add(self, key: str, subject: str, message: str) -> Optional[DuplicateMatch]:
+        """
+        Return the earlier submission this one duplicates, or index it under ``key``
+
+        Check and insert happen without yielding to the event loop, so two
+        concurrent copies of a message cannot both pass.
+        """
+        tokens = words(f"{subject} {message}")
+        if len(tokens) < self.min_words:
+            return None
+        signature = minhash(tokens)
+        match = self.index.most_similar(signature)
+        if match is not None:
+            return DuplicateMatch(key=match[0], similarity=match[1])
+        self.index.add(key, signature)
+        return None
+
+    def discard(self, key: str):
+        """
+        Forget a submission that was indexed but could not be stored
+        """
+        self.index.discard(key)
+
+
+contact_dedup = NearDuplicateDetector()
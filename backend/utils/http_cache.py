@@ -0,0 +1,102 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    Raised when a Range header cannot be served for the resource size
+    """
+
+
+def make_etag(data: bytes) -> str:
+    """
+    Strong ETag derived from the content
+    """
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _strip_weak(etag) in {_strip_weak(tag) for tag in if_none_match.split(",")}
+
+
+def is_not_modified(headers, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    Whether a conditional GET can be answered with 304
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= int(since)
+    return False
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end) offsets
+
+    Returns None when the whole resource should be sent (no header, another
+    unit, several ranges or a malformed value, including a last byte before
+    the first). Raises RangeNotSatisfiable when the range starts past the
+    end of the resource.
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_text == "":
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    # RFC 9110 14.1.1: an invalid range is ignored, not answered with 416
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def range_applies(headers, etag: str) -> bool:
+    """
+    Whether a Range header should be honoured given an optional If-Range validator
+    """
+    if_range = headers.get("if-range")
+    return if_range is None or if_range.strip() == etag
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+from typing import Any, Dict, List, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    keys: Tuple[Tuple[str, Union[int, str]], ...]
+    unique: bool = False
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def server_keys(self) -> Tuple[Tuple[str, Union[int, str]], ...]:
+        """
+        Key pattern as index_information() reports it; text indexes are
+        stored under the internal _fts/_ftsx keys whatever fields they cover
+        """
+        if any(direction == "text" for _, direction in self.keys):
+            return (("_fts", "text"), ("_ftsx", 1))
+        return self.keys
+
+    def create_kwargs(self) -> Dict[str, Any]:
+        kwargs = dict(self.options, name=self.name)
+        if self.unique:
+            kwargs["unique"] = True
+        return kwargs
+
+
+# Indexes each collection needs for the queries the API runs
+REQUIRED_INDEXES: Dict[str, List[IndexSpec]] = {
+    "contact_messages": [
+        # Lookups by public id
+        IndexSpec("id_unique", (("id", 1),), unique=True),
+        # Admin listing keyset order; also walked backwards by retention sweeps
+        IndexSpec("timestamp_id_desc", (("timestamp", -1), ("id", -1))),
+        # Admin listing filtered by status or sender, in keyset order
+        IndexSpec("status_timestamp_id_desc", (("status", 1), ("timestamp", -1), ("id", -1))),
+        IndexSpec("email_timestamp_id_desc", (("email", 1), ("timestamp", -1), ("id", -1))),
+        # Ranked inbox search; subject matches count for more than body text
+        IndexSpec(
+            "contact_text",
+            (("subject", "text"), ("message", "text"), ("name", "text")),
+            options={"weights": {"subject": 5, "name": 3, "message": 1}, "default_language": "english"}
+        ),
+    ],
+    "status_checks": [
+        IndexSpec("id_unique", (("id", 1),), unique=True),
+        IndexSpec("timestamp_id_desc", (("timestamp", -1), ("id", -1))),
+    ],
+    "rate_limit_hits": [
+        # Mongo rate-limit backend: hits per IP inside a window
+        IndexSpec("ip_address_timestamp", (("ip_address", 1), ("timestamp", -1))),
+        # Restoring in-memory limiter state at startup
+        IndexSpec("timestamp", (("timestamp", 1),)),
+        # Hits expire on their own once the window has passed
+        IndexSpec("expires_at_ttl", (("expires_at", 1),), options={"expireAfterSeconds": 0}),
+    ],
+    "notification_outbox": [
+        # Notification worker: due entries, oldest first, then reading back a claimed batch
+        IndexSpec("next_attempt_at", (("next_attempt_at", 1),)),
+        IndexSpec("claim", (("claim", 1),)),
+    ],
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorClient) -> Dict[str, List[str]]:
+    """
+    Create every declared index; existing identical indexes are a no-op
+    Returns the names that could not be created, per collection
+    """
+    failed: Dict[str, List[str]] = {}
+    for collection_name, specs in REQUIRED_INDEXES.items():
+        collection = db[collection_name]
+        for spec in specs:
+            try:
+                await collection.create_index(list(spec.keys), **spec.create_kwargs())
+            except OperationFailure as e:
+                # Typically an existing index with the same name/keys but different options
+                failed.setdefault(collection_name, []).append(spec.name)
+                logger.error(f"Could not create index {collection_name}.{spec.name}: {str(e)}")
+            except Exception as e:
+                failed.setdefault(collection_name, []).append(spec.name)
+                logger.error(f"Error creating index {collection_name}.{spec.name}: {str(e)}")
+
+    if not failed:
+        logger.info("All required indexes are in place")
+    return failed
+
+
+async def index_usage(collection) -> Dict[str, int]:
+    """
+    Operation counts per index since the server last started
+    """
+    try:
+        stats = await collection.aggregate([{"$indexStats": {}}]).to_list(length=None)
+    except Exception as e:
+        logger.warning(f"$indexStats unavailable for {collection.name}: {str(e)}")
+        return {}
+    return {entry["name"]: entry["accesses"]["ops"] for entry in stats}
+
+
+async def index_diagnostics(db: AsyncIOMotorClient) -> Dict[str, Any]:
+    """
+    Compare declared indexes with what exists and report missing, unused and undeclared ones
+    """
+    report: Dict[str, Any] = {}
+    for collection_name, specs in REQUIRED_INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        usage = await index_usage(collection)
+
+        existing_keys = {
+            name: tuple((key, direction if isinstance(direction, str) else int(direction)) for key, direction in info["key"])
+            for name, info in existing.items()
+        }
+        declared = {spec.name for spec in specs}
+
+        report[collection_name] = {
+            "missing": [spec.name for spec in specs if existing_keys.get(spec.name) != spec.server_keys()],
+            "unused": sorted(name for name, ops in usage.items() if ops == 0 and name != "_id_"),
+            "undeclared": sorted(name for name in existing if name not in declared and name != "_id_"),
+            "usage": usage,
+        }
+    return report
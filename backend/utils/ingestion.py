@@ -0,0 +1,230 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import os
+
+from utils.counters import increment_contact_count
+from utils.dedup import contact_dedup
+from utils.notifications import enqueue_notifications
+
+logger = logging.getLogger(__name__)
+
+# "direct" inserts each submission inside the request, "queued" hands it to
+# the write-behind worker below.
+CONTACT_INGESTION_MODE = os.environ.get("CONTACT_INGESTION_MODE", "direct").lower()
+CONTACT_QUEUE_MAX_SIZE = int(os.environ.get("CONTACT_QUEUE_MAX_SIZE", "1000"))
+CONTACT_BATCH_SIZE = int(os.environ.get("CONTACT_BATCH_SIZE", "100"))
+CONTACT_FLUSH_INTERVAL = float(os.environ.get("CONTACT_FLUSH_INTERVAL", "0.5"))
+CONTACT_RETRY_BACKOFF_SECONDS = float(os.environ.get("CONTACT_RETRY_BACKOFF_SECONDS", "0.5"))
+CONTACT_RETRY_BACKOFF_MAX_SECONDS = float(os.environ.get("CONTACT_RETRY_BACKOFF_MAX_SECONDS", "30"))
+
+# Write errors that fail the same way on every attempt: duplicate key and
+# document validation failure
+NON_RETRYABLE_WRITE_ERRORS = frozenset({11000, 121})
+DUPLICATE_KEY_ERROR = 11000
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue of documents flushed to a collection with ``insert_many``.
+
+    A batch is written as soon as ``batch_size`` documents are waiting or
+    ``flush_interval`` seconds after its first document arrived, whichever
+    comes first. ``enqueue`` never blocks: it returns False when the queue
+    is full so the caller can shed load. ``on_flush`` is called with the
+    documents each flush actually stored, ``on_failure`` with those that
+    were accepted but will never be stored.
+
+    Documents that fail to insert are kept and retried with exponential
+    backoff, ahead of newer documents, until they are stored. Only
+    documents rejected with a non-retryable write error (e.g. a duplicate
+    key) are given up on; they are logged with their ids.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        max_size: int = CONTACT_QUEUE_MAX_SIZE,
+        batch_size: int = CONTACT_BATCH_SIZE,
+        flush_interval: float = CONTACT_FLUSH_INTERVAL,
+        retry_backoff: float = CONTACT_RETRY_BACKOFF_SECONDS,
+        retry_backoff_max: float = CONTACT_RETRY_BACKOFF_MAX_SECONDS,
+        on_flush: Optional[Callable[[AsyncIOMotorClient, List[Dict[str, Any]]], Awaitable[None]]] = None,
+        on_failure: Optional[Callable[[AsyncIOMotorClient, List[Dict[str, Any]]], Awaitable[None]]] = None,
+    ):
+        self.collection_name = collection_name
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.on_flush = on_flush
+        self.on_failure = on_failure
+        self._queue: Optional[asyncio.Queue] = None
+        # Documents taken from the queue whose insert failed and will be retried
+        self._retry: List[Dict[str, Any]] = []
+        # The batch an insert is in flight for
+        self._current: List[Dict[str, Any]] = []
+        self._consecutive_failures = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._db = None
+        self._accepting = False
+        self.flushed = 0
+        self.failed = 0
+        self.retried = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, db: AsyncIOMotorClient):
+        """
+        Start the background flush worker on the running loop
+        """
+        if self.running:
+            return
+        self._db = db
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._accepting = True
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Started write-behind worker for {self.collection_name}")
+
+    def enqueue(self, document: Dict[str, Any]) -> bool:
+        """
+        Queue a document for insertion
+        Returns False if the queue is full or the worker is not running
+        """
+        if not self.running or not self._accepting:
+            return False
+        try:
+            self._queue.put_nowait(document)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Write-behind queue for {self.collection_name} is full")
+            return False
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: List[Dict[str, Any]], retrying: bool = False) -> int:
+        """
+        Insert a batch, keeping retryable failures in ``_retry``; returns the number stored
+        """
+        retry: List[Dict[str, Any]] = []
+        rejected: List[Dict[str, Any]] = []
+        try:
+            await self._db[self.collection_name].insert_many(batch, ordered=False)
+            stored = batch
+        except BulkWriteError as e:
+            errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+            stored = []
+            for index, document in enumerate(batch):
+                error = errors.get(index)
+                if error is None:
+                    stored.append(document)
+                elif error.get("code") == DUPLICATE_KEY_ERROR and retrying:
+                    # An earlier attempt that reported failure had written it after all
+                    stored.append(document)
+                elif error.get("code") in NON_RETRYABLE_WRITE_ERRORS:
+                    rejected.append(document)
+                else:
+                    retry.append(document)
+            if retry:
+                logger.error(f"Partial write-behind flush to {self.collection_name}: {len(retry)} to retry")
+        except Exception as e:
+            stored = []
+            retry = batch
+            logger.error(f"Error flushing write-behind batch to {self.collection_name}, will retry: {str(e)}")
+
+        if rejected:
+            ids = ", ".join(str(document.get("id")) for document in rejected)
+            logger.error(f"Dropped {len(rejected)} documents rejected by {self.collection_name}: {ids}")
+
+        self._retry = retry
+        self._consecutive_failures = self._consecutive_failures + 1 if retry else 0
+        inserted = len(stored)
+        self.flushed += inserted
+        self.failed += len(rejected)
+        if stored and self.on_flush is not None:
+            await self.on_flush(self._db, stored)
+        if rejected and self.on_failure is not None:
+            await self.on_failure(self._db, rejected)
+        # Retried documents stay unfinished, so drain() waits for them
+        for _ in range(len(stored) + len(rejected)):
+            self._queue.task_done()
+        return inserted
+
+    def _backoff(self) -> float:
+        return min(self.retry_backoff * 2 ** (self._consecutive_failures - 1), self.retry_backoff_max)
+
+    async def _run(self):
+        while True:
+            retrying = bool(self._retry)
+            if retrying:
+                await asyncio.sleep(self._backoff())
+                self.retried += len(self._retry)
+                self._current = self._retry
+            else:
+                self._current = await self._next_batch()
+            await self._flush(self._current, retrying)
+            self._current = []
+
+    async def drain(self, timeout: float = 10.0):
+        """
+        Stop accepting work and wait for everything still queued to be flushed
+        """
+        if self._worker is None:
+            return
+
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            lost = (self._current or self._retry) + [self._queue.get_nowait() for _ in range(self.qsize())]
+            ids = ", ".join(str(document.get("id")) for document in lost)
+            logger.error(f"Timed out draining {self.collection_name} write-behind queue, {len(lost)} documents not stored: {ids}")
+            if lost and self.on_failure is not None:
+                await self.on_failure(self._db, lost)
+
+        # Anything the worker still holds was logged above
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info(f"Drained write-behind queue for {self.collection_name}")
+
+
+async def _contacts_stored(db: AsyncIOMotorClient, documents: List[Dict[str, Any]]):
+    await increment_contact_count(db, len(documents))
+    await enqueue_notifications(db, documents)
+
+
+async def _contacts_not_stored(db: AsyncIOMotorClient, documents: List[Dict[str, Any]]):
+    # Let the sender's retry through instead of answering it as a duplicate
+    for document in documents:
+        contact_dedup.discard(document["id"])
+
+
+contact_ingestion = WriteBehindQueue("contact_messages", on_flush=_contacts_stored, on_failure=_contacts_not_stored)
+
+
+def queued_ingestion_enabled() -> bool:
+    return CONTACT_INGESTION_MODE == "queued"
@@ -0,0 +1,220 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond handlers to slow queries
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels, safe to update from any thread
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        if not values and not self.labelnames:
+            values[()] = 0.0
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in sorted(values.items())]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; an observation updates a single bucket and the
+    cumulative counts are only computed when rendering
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._data: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._data.get(labelvalues)
+            if data is None:
+                # One slot per bucket, one for +Inf, then the running sum
+                data = [0.0] * (len(self.buckets) + 2)
+                self._data[labelvalues] = data
+            data[index] += 1
+            data[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            snapshot = {labels: list(data) for labels, data in self._data.items()}
+
+        lines = []
+        for labels, data in sorted(snapshot.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), data):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {data[-1]!r}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_number(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics rendered together in the Prometheus text exposition format
+    """
+
+    def __init__(self):
+        self._metrics: List[object] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, float]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, float]]]):
+        """
+        Register a callback yielding (name, type, help, value) samples at scrape time
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, kind, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status code", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route", ("method", "route")
+)
+MONGO_COMMAND_DURATION = registry.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by command name", ("command",)
+)
+MONGO_COMMAND_FAILURES = registry.counter(
+    "mongo_command_failures_total", "Failed MongoDB commands by command name", ("command",)
+)
+RATE_LIMIT_REJECTIONS = registry.counter(
+    "rate_limit_rejections_total", "Contact submissions rejected by the rate limiter"
+)
+SPAM_REJECTIONS = registry.counter(
+    "spam_rejections_total", "Contact submissions rejected as spam"
+)
+DUPLICATE_SUBMISSIONS = registry.counter(
+    "contact_duplicates_total", "Near-duplicate contact submissions by action taken", ("action",)
+)
+NOTIFICATION_DELIVERIES = registry.counter(
+    "notification_deliveries_total", "Notification delivery attempts by transport and outcome", ("transport", "outcome")
+)
+NOTIFICATION_DEAD_LETTERS = registry.counter(
+    "notification_dead_letters_total", "Notifications given up on after exhausting their retries"
+)
+NOTIFICATION_LATENCY = registry.histogram(
+    "notification_latency_seconds", "Time from a contact message being stored to its notification being delivered", ("transport",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0, 3600.0)
+)
+RESPONSE_CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total", "Requests to cached routes by path and result (hit, stale, coalesced, miss)", ("path", "result")
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request counts and latency
+
+    Routes are labelled by their path template (``/api/admin/contacts/{id}``
+    rather than the concrete URL) so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_templates: Dict[object, str] = {}
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        template = self._route_templates.get(endpoint)
+        if template is None:
+            templates = {getattr(route, "endpoint", None): route.path for route in scope["app"].routes}
+            template = templates.setdefault(endpoint, UNMATCHED_ROUTE)
+            self._route_templates = templates
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = self._route_template(scope)
+            HTTP_REQUEST_DURATION.observe(duration, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
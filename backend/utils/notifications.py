@@ -0,0 +1,456 @@
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import asyncio
+import logging
+import os
+import random
+import smtplib
+import uuid
+
+import httpx
+
+from utils.metrics import NOTIFICATION_DEAD_LETTERS, NOTIFICATION_DELIVERIES, NOTIFICATION_LATENCY
+from utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Transports are enabled by configuring them: a webhook URL, and/or a
+# recipient address for mail relayed through the SMTP server below (by
+# default a local stand-in such as MailHog on port 1025).
+NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL")
+NOTIFY_EMAIL_TO = os.environ.get("NOTIFY_EMAIL_TO")
+NOTIFY_EMAIL_FROM = os.environ.get("NOTIFY_EMAIL_FROM", "portfolio@localhost")
+NOTIFY_SMTP_HOST = os.environ.get("NOTIFY_SMTP_HOST", "localhost")
+NOTIFY_SMTP_PORT = int(os.environ.get("NOTIFY_SMTP_PORT", "1025"))
+NOTIFY_SMTP_STARTTLS = os.environ.get("NOTIFY_SMTP_STARTTLS", "false").lower() in ("1", "true", "yes")
+NOTIFY_SMTP_USERNAME = os.environ.get("NOTIFY_SMTP_USERNAME")
+NOTIFY_SMTP_PASSWORD = os.environ.get("NOTIFY_SMTP_PASSWORD")
+NOTIFY_TIMEOUT_SECONDS = float(os.environ.get("NOTIFY_TIMEOUT_SECONDS", "10"))
+
+NOTIFY_BATCH_SIZE = int(os.environ.get("NOTIFY_BATCH_SIZE", "20"))
+# Longest the worker sleeps when idle; new entries wake it immediately
+NOTIFY_POLL_INTERVAL_SECONDS = float(os.environ.get("NOTIFY_POLL_INTERVAL_SECONDS", "5"))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get("NOTIFY_MAX_ATTEMPTS", "8"))
+NOTIFY_BACKOFF_SECONDS = float(os.environ.get("NOTIFY_BACKOFF_SECONDS", "5"))
+NOTIFY_BACKOFF_MAX_SECONDS = float(os.environ.get("NOTIFY_BACKOFF_MAX_SECONDS", "3600"))
+# A claimed entry is offered to other workers again if not settled within this time
+NOTIFY_LEASE_SECONDS = float(os.environ.get("NOTIFY_LEASE_SECONDS", "120"))
+
+OUTBOX_COLLECTION = "notification_outbox"
+DEAD_LETTER_COLLECTION = "notification_dead_letters"
+CONTACT_MESSAGE_EVENT = "contact_message.created"
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def outbox_entry(contact: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """
+    Outbox document announcing a stored contact message
+
+    Keyed by the message id, so writing the same entry twice is harmless.
+    """
+    return {
+        "_id": contact["id"],
+        "event": CONTACT_MESSAGE_EVENT,
+        "payload": {
+            "id": contact["id"],
+            "name": contact["name"],
+            "email": contact["email"],
+            "subject": contact["subject"],
+            "message": contact["message"],
+            "timestamp": contact["timestamp"],
+        },
+        # Transports that already succeeded are skipped on retries
+        "delivered": [],
+        "attempts": 0,
+        "next_attempt_at": now,
+        "claim": None,
+        "lease_until": None,
+        "last_error": None,
+        "created_at": now,
+    }
+
+
+def backoff_delay(attempts: int, base: float = NOTIFY_BACKOFF_SECONDS, cap: float = NOTIFY_BACKOFF_MAX_SECONDS) -> float:
+    """
+    Exponential backoff with jitter: half the delay is fixed, half random
+    """
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class WebhookTransport:
+    """
+    POSTs each notification as JSON through one pooled HTTP client
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = NOTIFY_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def open(self):
+        self._client = httpx.AsyncClient(timeout=self.timeout)
+
+    async def send(self, entry: Dict[str, Any]):
+        response = await self._client.post(
+            self.url,
+            content=dumps({"event": entry["event"], "data": entry["payload"]}),
+            # Retries resend the same key so the receiver can drop repeats
+            headers={"Content-Type": "application/json", "Idempotency-Key": str(entry["_id"])}
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(f"webhook returned HTTP {response.status_code}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _single_line(value: str) -> str:
+    """
+    Collapse all whitespace, including line breaks, to single spaces
+    """
+    return " ".join(value.split())
+
+
+class SMTPTransport:
+    """
+    Sends each notification as an email over one persistent SMTP connection
+
+    smtplib is blocking, so sends run in a worker thread, one at a time;
+    the connection is reopened when the server has dropped it.
+    """
+
+    name = "email"
+
+    def __init__(
+        self,
+        recipient: str,
+        sender: str = NOTIFY_EMAIL_FROM,
+        host: str = NOTIFY_SMTP_HOST,
+        port: int = NOTIFY_SMTP_PORT,
+        starttls: bool = NOTIFY_SMTP_STARTTLS,
+        username: Optional[str] = NOTIFY_SMTP_USERNAME,
+        password: Optional[str] = NOTIFY_SMTP_PASSWORD,
+        timeout: float = NOTIFY_TIMEOUT_SECONDS,
+    ):
+        self.recipient = recipient
+        self.sender = sender
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._lock = asyncio.Lock()
+
+    async def open(self):
+        pass
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    def _send_message(self, message: EmailMessage):
+        for retry in (False, True):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Idle connections are closed by the server; reconnect once
+                self._smtp = None
+                if retry:
+                    raise
+            except OSError:
+                self._smtp = None
+                raise
+
+    def build_message(self, entry: Dict[str, Any]) -> EmailMessage:
+        payload = entry["payload"]
+        # Submitted values may carry CR/LF, which header assignment rejects
+        subject, name, email = (_single_line(payload[field]) for field in ("subject", "name", "email"))
+        message = EmailMessage()
+        message["Subject"] = f"New contact message: {subject}"
+        message["From"] = self.sender
+        message["To"] = self.recipient
+        message["Reply-To"] = email
+        message.set_content(
+            f"From: {name} <{email}>\n"
+            f"Received: {payload['timestamp']}\n"
+            f"Message id: {payload['id']}\n\n"
+            f"{payload['message']}\n"
+        )
+        return message
+
+    async def send(self, entry: Dict[str, Any]):
+        message = self.build_message(entry)
+        async with self._lock:
+            await asyncio.to_thread(self._send_message, message)
+
+    def _quit(self):
+        try:
+            self._smtp.quit()
+        except Exception:
+            pass
+        self._smtp = None
+
+    async def close(self):
+        async with self._lock:
+            if self._smtp is not None:
+                await asyncio.to_thread(self._quit)
+
+
+def configured_transports() -> List[Any]:
+    transports: List[Any] = []
+    if NOTIFY_WEBHOOK_URL:
+        transports.append(WebhookTransport(NOTIFY_WEBHOOK_URL))
+    if NOTIFY_EMAIL_TO:
+        transports.append(SMTPTransport(NOTIFY_EMAIL_TO))
+    return transports
+
+
+class NotificationWorker:
+    """
+    Background delivery of outbox entries
+
+    Entries are claimed in batches: due ids are read, stamped with a claim
+    token and lease in one ``update_many``, then read back by token, so
+    several app instances can share the outbox without delivering an entry
+    twice while its lease holds. Each claimed entry is sent to every
+    transport it has not reached yet, concurrently across the batch.
+    Delivered entries are deleted; failed ones are rescheduled with
+    backoff, and moved to the dead-letter collection after
+    ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        transports: Optional[Sequence[Any]] = None,
+        batch_size: int = NOTIFY_BATCH_SIZE,
+        poll_interval: float = NOTIFY_POLL_INTERVAL_SECONDS,
+        max_attempts: int = NOTIFY_MAX_ATTEMPTS,
+        lease_seconds: float = NOTIFY_LEASE_SECONDS,
+    ):
+        self.transports = list(configured_transports() if transports is None else transports)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.transports)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, db: AsyncIOMotorClient):
+        """
+        Start the delivery loop on the running loop
+        """
+        if self.running or not self.enabled:
+            return
+        self._db = db
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Started notification worker ({', '.join(t.name for t in self.transports)})")
+
+    def notify(self):
+        """
+        Wake the worker because new entries were written
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        outbox = self._db[OUTBOX_COLLECTION]
+        now = datetime.utcnow()
+        due = {"next_attempt_at": {"$lte": now}, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]}
+        candidates = await outbox.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(self.batch_size).to_list(length=self.batch_size)
+        if not candidates:
+            return []
+
+        claim = uuid.uuid4().hex
+        # Re-checking ``due`` makes the claim exclusive when workers race for the same ids
+        await outbox.update_many(
+            dict(due, _id={"$in": [doc["_id"] for doc in candidates]}),
+            {"$set": {"claim": claim, "lease_until": now + timedelta(seconds=self.lease_seconds)}}
+        )
+        return await outbox.find({"claim": claim}).to_list(length=self.batch_size)
+
+    async def _deliver(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Send an entry to its remaining transports; returns the last error, if any
+        """
+        error = None
+        for transport in self.transports:
+            if transport.name in entry["delivered"]:
+                continue
+            try:
+                await transport.send(entry)
+            except Exception as e:
+                error = f"{transport.name}: {str(e)}"
+                NOTIFICATION_DELIVERIES.inc(transport.name, "failed")
+                continue
+            entry["delivered"].append(transport.name)
+            NOTIFICATION_DELIVERIES.inc(transport.name, "delivered")
+            NOTIFICATION_LATENCY.observe((datetime.utcnow() - entry["created_at"]).total_seconds(), transport.name)
+        return error
+
+    async def process_batch(self) -> int:
+        """
+        Claim and deliver one batch; returns the number of entries claimed
+        """
+        entries = await self._claim()
+        if not entries:
+            return 0
+        errors = await asyncio.gather(*(self._deliver(entry) for entry in entries))
+
+        outbox = self._db[OUTBOX_COLLECTION]
+        now = datetime.utcnow()
+        done = [entry["_id"] for entry, error in zip(entries, errors) if error is None]
+        retries = []
+        dead = []
+        for entry, error in zip(entries, errors):
+            if error is None:
+                continue
+            entry["attempts"] += 1
+            entry["last_error"] = error
+            if entry["attempts"] >= self.max_attempts:
+                dead.append(entry)
+            else:
+                retries.append(UpdateOne(
+                    {"_id": entry["_id"], "claim": entry["claim"]},
+                    {"$set": {
+                        "delivered": entry["delivered"],
+                        "attempts": entry["attempts"],
+                        "last_error": error,
+                        "next_attempt_at": now + timedelta(seconds=backoff_delay(entry["attempts"])),
+                        "claim": None,
+                        "lease_until": None,
+                    }}
+                ))
+                logger.warning(f"Notification {entry['_id']} failed (attempt {entry['attempts']}): {error}")
+
+        if dead:
+            await self._dead_letter(dead, now)
+            done.extend(entry["_id"] for entry in dead)
+        if retries:
+            await outbox.bulk_write(retries, ordered=False)
+        if done:
+            await outbox.delete_many({"_id": {"$in": done}})
+
+        self.delivered += len(entries) - len(retries) - len(dead)
+        self.retried += len(retries)
+        self.dead_lettered += len(dead)
+        return len(entries)
+
+    async def _dead_letter(self, entries: List[Dict[str, Any]], now: datetime):
+        for entry in entries:
+            entry["dead_lettered_at"] = now
+            entry["claim"] = None
+            entry["lease_until"] = None
+            logger.error(f"Notification {entry['_id']} dead-lettered after {entry['attempts']} attempts: {entry['last_error']}")
+        try:
+            await self._db[DEAD_LETTER_COLLECTION].insert_many(entries, ordered=False)
+        except BulkWriteError as e:
+            # Left over from a batch that was dead-lettered but not yet removed
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+        NOTIFICATION_DEAD_LETTERS.inc(amount=len(entries))
+
+    async def _run(self):
+        for transport in self.transports:
+            await transport.open()
+        try:
+            while True:
+                try:
+                    claimed = await self.process_batch()
+                except Exception as e:
+                    logger.error(f"Error processing notification outbox: {str(e)}")
+                    claimed = 0
+                if claimed < self.batch_size:
+                    # Caught up: sleep until new entries arrive or the poll interval passes
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+        finally:
+            for transport in self.transports:
+                try:
+                    await transport.close()
+                except Exception as e:
+                    logger.error(f"Error closing {transport.name} transport: {str(e)}")
+
+    async def stop(self):
+        """
+        Stop the delivery loop; claimed entries are offered again once their lease expires
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Stopped notification worker")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "transports": [transport.name for transport in self.transports],
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+notification_worker = NotificationWorker()
+
+
+async def enqueue_notifications(db: AsyncIOMotorClient, contacts: Iterable[Dict[str, Any]]):
+    """
+    Write outbox entries for stored contact messages and wake the worker
+
+    Called right after the messages are stored. Failures are logged rather
+    than raised: the messages themselves are already saved.
+    """
+    if not notification_worker.enabled:
+        return
+    now = datetime.utcnow()
+    entries = [outbox_entry(contact, now) for contact in contacts]
+    if not entries:
+        return
+    try:
+        await db[OUTBOX_COLLECTION].insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+            logger.error(f"Error writing notification outbox entries: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error writing notification outbox entries: {str(e)}")
+    notification_worker.notify()
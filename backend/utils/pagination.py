@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Keyset order shared by the listing endpoints: newest first, id as tie-breaker
+KEYSET_SORT: List[Tuple[str, int]] = [("timestamp", -1), ("id", -1)]
+
+# Text search results: best match first, then keyset order among equal scores
+SCORE_FIELD = "score"
+RANKED_SORT: Dict[str, Any] = {SCORE_FIELD: {"$meta": "textScore"}, "timestamp": -1, "id": -1}
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """
+    Encode the (timestamp, id) position of a document as an opaque cursor
+    """
+    return _encode({"t": document["timestamp"].isoformat(), "id": document["id"]})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor
+    Raises ValueError if the cursor is malformed
+    """
+    try:
+        payload = _decode(cursor)
+        return datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_ranked_cursor(document: Dict[str, Any]) -> str:
+    """
+    Encode the (score, timestamp, id) position of a text search result
+    """
+    return _encode({
+        "s": document[SCORE_FIELD],
+        "t": document["timestamp"].isoformat(),
+        "id": document["id"],
+    })
+
+
+def decode_ranked_cursor(cursor: str) -> Tuple[float, datetime, str]:
+    """
+    Decode a cursor produced by encode_ranked_cursor
+    Raises ValueError if the cursor is malformed
+    """
+    try:
+        payload = _decode(cursor)
+        return float(payload["s"]), datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the query matching documents strictly after the cursor in KEYSET_SORT order
+    """
+    if not cursor:
+        return {}
+    timestamp, last_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": last_id}},
+        ]
+    }
+
+
+def ranked_keyset_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Match text search results strictly after the cursor in RANKED_SORT order
+
+    Applied after the score has been added to each document, since the
+    text score cannot be queried before the $text stage.
+    """
+    if not cursor:
+        return {}
+    score, timestamp, last_id = decode_ranked_cursor(cursor)
+    return {
+        "$or": [
+            {SCORE_FIELD: {"$lt": score}},
+            {SCORE_FIELD: score, "timestamp": {"$lt": timestamp}},
+            {SCORE_FIELD: score, "timestamp": timestamp, "id": {"$lt": last_id}},
+        ]
+    }
+
+
+def next_cursor(page: List[Dict[str, Any]], limit: int, ranked: bool = False) -> Optional[str]:
+    """
+    Cursor for the page after ``page``, or None if it was the last one
+    """
+    if len(page) < limit or not page:
+        return None
+    return encode_ranked_cursor(page[-1]) if ranked else encode_cursor(page[-1])
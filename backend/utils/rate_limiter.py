@@ -1,48 +1,210 @@
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Deque, Dict, Optional, Set, Tuple
+import asyncio
 import logging
+import os
+import time
+
+from utils.metrics import RATE_LIMIT_REJECTIONS
 
 logger = logging.getLogger(__name__)
 
+# Selectable backends: "memory" keeps per-IP state in process, "mongo" records
+# and counts hits in the rate_limit_hits collection on every check.
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_MAX_ENTRIES = int(os.environ.get("RATE_LIMIT_MAX_ENTRIES", "100000"))
+RATE_LIMIT_PERSIST = os.environ.get("RATE_LIMIT_PERSIST", "false").lower() in ("1", "true", "yes")
+RATE_LIMIT_STATE_COLLECTION = "rate_limit_hits"
+
+
+def rate_limit_hit_document(ip_address: str, timestamp: datetime, window_seconds: float) -> dict:
+    """
+    Hit record; ``expires_at`` drives the collection's TTL index
+    """
+    return {
+        "ip_address": ip_address,
+        "timestamp": timestamp,
+        "expires_at": timestamp + timedelta(seconds=window_seconds),
+    }
+
+
+class SlidingWindowRateLimiter:
+    """
+    In-memory sliding-window log limiter.
+
+    Each IP keeps a deque of at most ``max_requests`` hit times, so a check is
+    O(1) amortised. IPs are kept in LRU order and the least recently seen one
+    is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_requests: int = 5, window_seconds: float = 3600, max_entries: int = RATE_LIMIT_MAX_ENTRIES):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._db = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+    def hit(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Record a request for ``key`` if it is within the limit.
+        Returns True if allowed, False if the limit is exceeded.
+        """
+        if now is None:
+            now = time.time()
+        cutoff = now - self.window_seconds
+
+        hits = self._bucket(key)
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+
+        if len(hits) >= self.max_requests:
+            return False
+
+        hits.append(now)
+        if self._db is not None:
+            self._write_through(key, now)
+        return True
+
+    def _bucket(self, key: str) -> Deque[float]:
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = deque(maxlen=self.max_requests)
+            self._hits[key] = hits
+            if len(self._hits) > self.max_entries:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+        return hits
+
+    def enable_write_through(self, db: AsyncIOMotorClient):
+        """
+        Persist accepted hits to Mongo in the background so state survives restarts
+        """
+        self._db = db
+
+    def _write_through(self, key: str, now: float):
+        try:
+            task = asyncio.get_running_loop().create_task(self._persist_hit(key, now))
+        except RuntimeError:
+            # No running loop (e.g. synchronous benchmarks), nothing to persist to
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _persist_hit(self, key: str, now: float):
+        try:
+            await self._db[RATE_LIMIT_STATE_COLLECTION].insert_one(
+                rate_limit_hit_document(key, datetime.utcfromtimestamp(now), self.window_seconds)
+            )
+        except Exception as e:
+            logger.error(f"Error persisting rate limit hit: {str(e)}")
+
+    async def load_state(self, db: AsyncIOMotorClient):
+        """
+        Restore hits recorded inside the current window from Mongo
+        """
+        since = datetime.utcnow() - timedelta(seconds=self.window_seconds)
+        cursor = db[RATE_LIMIT_STATE_COLLECTION].find(
+            {"timestamp": {"$gte": since}},
+            {"_id": 0, "ip_address": 1, "timestamp": 1},
+        ).sort("timestamp", 1)
+
+        restored = 0
+        async for doc in cursor:
+            ts = doc["timestamp"]
+            self._bucket(doc["ip_address"]).append((ts - datetime(1970, 1, 1)).total_seconds())
+            restored += 1
+
+        logger.info(f"Restored {restored} rate limit hits for {len(self._hits)} IPs")
+
+    async def flush(self):
+        """
+        Wait for outstanding write-through inserts
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+
+_memory_limiters: Dict[Tuple[int, float], SlidingWindowRateLimiter] = {}
+
+
+def get_memory_limiter(max_requests: int = 5, window_hours: float = 1) -> SlidingWindowRateLimiter:
+    """
+    Get the shared in-memory limiter for the given limit settings
+    """
+    key = (max_requests, window_hours * 3600)
+    limiter = _memory_limiters.get(key)
+    if limiter is None:
+        limiter = SlidingWindowRateLimiter(max_requests=max_requests, window_seconds=key[1])
+        _memory_limiters[key] = limiter
+    return limiter
+
+
+async def init_rate_limiter(db: AsyncIOMotorClient):
+    """
+    Restore and enable write-through persistence for the default limiter
+    """
+    if RATE_LIMIT_BACKEND != "memory" or not RATE_LIMIT_PERSIST:
+        return
+
+    limiter = get_memory_limiter()
+    try:
+        await limiter.load_state(db)
+    except Exception as e:
+        logger.error(f"Error restoring rate limit state: {str(e)}")
+    limiter.enable_write_through(db)
+
+
 async def check_rate_limit(ip_address: str, db: AsyncIOMotorClient, max_requests: int = 5, window_hours: int = 1) -> bool:
     """
-    Check if IP address is within rate limit
+    Check if IP address is within rate limit using the configured backend
+    Returns True if within limit, False if exceeded
+    """
+    if RATE_LIMIT_BACKEND == "mongo":
+        return await check_rate_limit_mongo(ip_address, db, max_requests, window_hours)
+
+    if not get_memory_limiter(max_requests, window_hours).hit(ip_address):
+        RATE_LIMIT_REJECTIONS.inc()
+        logger.warning(f"Rate limit exceeded for IP: {ip_address}")
+        return False
+    return True
+
+
+async def check_rate_limit_mongo(ip_address: str, db: AsyncIOMotorClient, max_requests: int = 5, window_hours: int = 1) -> bool:
+    """
+    Check rate limit by counting hits recorded for the IP in Mongo
     Returns True if within limit, False if exceeded
     """
     try:
         # Calculate time window
-        time_window = datetime.utcnow() - timedelta(hours=window_hours)
-        
+        now = datetime.utcnow()
+        time_window = now - timedelta(hours=window_hours)
+
         # Count requests from this IP in the time window
-        count = await db.contact_messages.count_documents({
+        count = await db[RATE_LIMIT_STATE_COLLECTION].count_documents({
             "ip_address": ip_address,
             "timestamp": {"$gte": time_window}
         })
-        
+
         # Check if within limit
         if count >= max_requests:
+            RATE_LIMIT_REJECTIONS.inc()
             logger.warning(f"Rate limit exceeded for IP: {ip_address} ({count} requests)")
             return False
-        
+
+        # Old hits are removed by the TTL index on expires_at
+        await db[RATE_LIMIT_STATE_COLLECTION].insert_one(
+            rate_limit_hit_document(ip_address, now, window_hours * 3600)
+        )
         return True
-        
+
     except Exception as e:
         logger.error(f"Error checking rate limit: {str(e)}")
         # Allow request if rate limiting check fails
         return True
-
-async def cleanup_old_rate_limit_data(db: AsyncIOMotorClient, days_old: int = 7):
-    """
-    Clean up old contact messages for rate limiting
-    """
-    try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
-        
-        result = await db.contact_messages.delete_many({
-            "timestamp": {"$lt": cutoff_date}
-        })
-        
-        logger.info(f"Cleaned up {result.deleted_count} old contact messages")
-        
-    except Exception as e:
-        logger.error(f"Error cleaning up old rate limit data: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,339 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from utils.metrics import RESPONSE_CACHE_REQUESTS, registry
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Larger responses (e.g. long NDJSON streams) are passed through uncached
+RESPONSE_CACHE_MAX_BODY_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BODY_BYTES", str(1024 * 1024)))
+
+POLICY_ATTRIBUTE = "__response_cache_policy__"
+# Responses carrying these are specific to one client and never stored
+_UNCACHEABLE_DIRECTIVES = (b"no-store", b"private")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    # Seconds a stored response is served as-is
+    ttl: float
+    # Further seconds it may be served while one request refreshes it
+    stale_ttl: float = 0.0
+    # Invalidation groups this route's responses belong to
+    tags: Tuple[str, ...] = ()
+    # Request headers that select different representations
+    vary: Tuple[str, ...] = ("accept",)
+
+
+def cache_response(ttl: float, stale_ttl: float = 0.0, tags: Tuple[str, ...] = (), vary: Tuple[str, ...] = ("accept",)):
+    """
+    Mark a GET route's responses as cacheable by ResponseCacheMiddleware
+
+    Apply below the router decorator. Only routes without path parameters
+    are cached; the key is the path, query string and ``vary`` headers.
+    """
+    policy = CachePolicy(ttl=ttl, stale_ttl=stale_ttl, tags=tuple(tags), vary=tuple(header.lower() for header in vary))
+
+    def decorate(endpoint: Callable) -> Callable:
+        setattr(endpoint, POLICY_ATTRIBUTE, policy)
+        return endpoint
+    return decorate
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    tags: Tuple[str, ...]
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+class ResponseCache:
+    """
+    LRU-bounded store of complete responses with tag-based invalidation
+
+    Bounded by entry count and total bytes. Each tag carries a generation
+    number bumped on invalidation, so a response computed while its tag
+    was invalidated is not stored.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._tagged: Dict[str, Set[Tuple]] = {}
+        self._generations: Dict[str, int] = {}
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def generation(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def put(self, key: Tuple, entry: CachedResponse):
+        self._remove(key)
+        self._entries[key] = entry
+        self.nbytes += entry.nbytes
+        for tag in entry.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.nbytes -= entry.nbytes
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def invalidate(self, *tags: str):
+        """
+        Drop every stored response carrying any of ``tags``
+        """
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in list(self._tagged.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        self.invalidate(*list(self._tagged))
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "tags": {tag: len(keys) for tag, keys in self._tagged.items()},
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _cache_samples():
+    yield "response_cache_entries", "gauge", "Responses held by the response cache", len(response_cache)
+    yield "response_cache_bytes", "gauge", "Bytes held by the response cache", response_cache.nbytes
+
+
+registry.add_collector(_cache_samples)
+
+
+def _background_receive():
+    """
+    Receive callable for a refresh with no client: an empty body, then no
+    disconnect ever (streaming responses wait on one until they finish)
+    """
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+    return receive
+
+
+class _Capture:
+    """
+    ASGI send callable recording a response, optionally forwarding it to the client
+    """
+
+    def __init__(self, send: Optional[Callable] = None, max_body: int = RESPONSE_CACHE_MAX_BODY_BYTES):
+        self._send = send
+        self.max_body = max_body
+        self.status = 0
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self.cacheable = True
+        self.complete = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = list(message.get("headers", []))
+            if self.status != 200:
+                self.cacheable = False
+            for name, value in self.headers:
+                if name == b"set-cookie" or (name == b"cache-control" and any(d in value for d in _UNCACHEABLE_DIRECTIVES)):
+                    self.cacheable = False
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if self.cacheable:
+                self._size += len(body)
+                if self._size > self.max_body:
+                    self.cacheable = False
+                    self._chunks = []
+                else:
+                    self._chunks.append(body)
+            if not message.get("more_body", False):
+                self.complete = True
+        if self._send is not None:
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=self.headers + [(b"x-cache", b"MISS")])
+            await self._send(message)
+
+    def result(self, policy: CachePolicy, now: float) -> Optional[CachedResponse]:
+        if not (self.cacheable and self.complete):
+            return None
+        return CachedResponse(
+            status=self.status,
+            headers=self.headers,
+            body=b"".join(self._chunks),
+            tags=policy.tags,
+            stored_at=now,
+            fresh_until=now + policy.ttl,
+            stale_until=now + policy.ttl + policy.stale_ttl,
+        )
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving routes marked with ``cache_response`` from memory
+
+    Concurrent misses for the same key are coalesced: the first request
+    computes the response (streaming it to its own client as usual) and
+    the rest await its result instead of running the route. Within
+    ``stale_ttl`` after expiry the stored response is still served while a
+    single background request refreshes it.
+
+    Responses are stored inside CORS handling, so per-origin headers are
+    never replayed to a different origin.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache, enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.app = app
+        self.cache = cache
+        self.enabled = enabled
+        self._routes: Optional[Dict[str, Tuple[Callable, CachePolicy]]] = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+
+    def _route(self, scope) -> Optional[Tuple[Callable, CachePolicy]]:
+        if self._routes is None:
+            # Built on the first request, once every route is registered
+            self._routes = {
+                route.path: (route.endpoint, getattr(route.endpoint, POLICY_ATTRIBUTE))
+                for route in scope["app"].routes
+                if hasattr(getattr(route, "endpoint", None), POLICY_ATTRIBUTE)
+                and "GET" in getattr(route, "methods", ())
+                and "{" not in route.path
+            }
+        return self._routes.get(scope["path"])
+
+    def _key(self, scope, policy: CachePolicy) -> Tuple:
+        headers = dict(scope["headers"]) if policy.vary else {}
+        return (scope["path"], scope["query_string"]) + tuple(headers.get(name.encode(), b"") for name in policy.vary)
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        route = self._route(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        endpoint, policy = route
+        # Replayed responses never reach the router; set what it would, so
+        # outer middleware (request metrics) still sees the matched route
+        scope["endpoint"] = endpoint
+
+        key = self._key(scope, policy)
+        now = time.monotonic()
+        entry = self.cache.get(key)
+        if entry is not None and now < entry.fresh_until:
+            RESPONSE_CACHE_REQUESTS.inc(scope["path"], "hit")
+            await self._replay(entry, send, now, b"HIT")
+            return
+        if entry is not None and now < entry.stale_until:
+            RESPONSE_CACHE_REQUESTS.inc(scope["path"], "stale")
+            if key not in self._inflight:
+                # Registered before the task starts, so concurrent stale hits schedule one refresh
+                future = self._register(key)
+                task = asyncio.get_running_loop().create_task(self._compute(dict(scope), _background_receive(), None, key, policy, future))
+                self._refreshing.add(task)
+                task.add_done_callback(self._refreshing.discard)
+            await self._replay(entry, send, now, b"STALE")
+            return
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # shield: a disconnecting follower must not cancel the leader's result
+            entry = await asyncio.shield(inflight)
+            if entry is not None:
+                RESPONSE_CACHE_REQUESTS.inc(scope["path"], "coalesced")
+                await self._replay(entry, send, time.monotonic(), b"HIT")
+                return
+            # The leader's response could not be shared; compute our own
+            await self.app(scope, receive, send)
+            return
+
+        RESPONSE_CACHE_REQUESTS.inc(scope["path"], "miss")
+        await self._compute(scope, receive, send, key, policy, self._register(key))
+
+    def _register(self, key: Tuple) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    async def _compute(self, scope, receive, send, key: Tuple, policy: CachePolicy, future: asyncio.Future):
+        """
+        Run the route once for ``key``, storing and sharing the response if cacheable
+
+        ``future`` is already registered in ``_inflight`` and is resolved here.
+        """
+        generation = self.cache.generation(policy.tags)
+        capture = _Capture(send)
+        entry = None
+        try:
+            await self.app(scope, receive, capture)
+            entry = capture.result(policy, time.monotonic())
+            # Responses computed across an invalidation are shared but not kept
+            if entry is not None and self.cache.generation(policy.tags) == generation:
+                self.cache.put(key, entry)
+        except Exception as e:
+            if send is not None:
+                raise
+            logger.error(f"Error refreshing cached response for {scope['path']}: {str(e)}")
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(entry)
+
+    async def _replay(self, entry: CachedResponse, send, now: float, result: bytes):
+        headers = entry.headers + [
+            (b"age", str(int(now - entry.stored_at)).encode()),
+            (b"x-cache", result),
+        ]
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
+import asyncio
+import logging
+import os
+
+from utils.counters import adjust_contact_counts
+
+logger = logging.getLogger(__name__)
+
+# Contact messages older than this many days are moved out of the inbox;
+# 0 disables retention entirely.
+CONTACT_RETENTION_DAYS = int(os.environ.get("CONTACT_RETENTION_DAYS", "0"))
+CONTACT_ARCHIVE_ENABLED = os.environ.get("CONTACT_ARCHIVE_ENABLED", "true").lower() in ("1", "true", "yes")
+CONTACT_ARCHIVE_BATCH_SIZE = int(os.environ.get("CONTACT_ARCHIVE_BATCH_SIZE", "500"))
+CONTACT_ARCHIVE_PAUSE_SECONDS = float(os.environ.get("CONTACT_ARCHIVE_PAUSE_SECONDS", "0.5"))
+CONTACT_RETENTION_INTERVAL_SECONDS = float(os.environ.get("CONTACT_RETENTION_INTERVAL_SECONDS", "86400"))
+CONTACT_ARCHIVE_COLLECTION = "contact_messages_archive"
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def retention_enabled() -> bool:
+    return CONTACT_RETENTION_DAYS > 0
+
+
+async def archive_old_contact_messages(
+    db: AsyncIOMotorClient,
+    retention_days: int = CONTACT_RETENTION_DAYS,
+    batch_size: int = CONTACT_ARCHIVE_BATCH_SIZE,
+    pause_seconds: float = CONTACT_ARCHIVE_PAUSE_SECONDS,
+    archive: bool = CONTACT_ARCHIVE_ENABLED,
+) -> int:
+    """
+    Move contact messages past the retention period out of the inbox in small batches
+
+    Each batch is copied to the archive collection (if enabled) and then
+    deleted by _id, with a pause between batches so no single sweep holds
+    the collection for long. Returns the number of messages removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    removed = 0
+
+    while True:
+        batch = await db.contact_messages.find(
+            {"timestamp": {"$lt": cutoff}}
+        ).sort("timestamp", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        if archive:
+            try:
+                await db[CONTACT_ARCHIVE_COLLECTION].insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Documents left over from an interrupted sweep are already archived
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                    raise
+
+        result = await db.contact_messages.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        removed += result.deleted_count
+        # Status counts come from the batch; reconciliation absorbs any concurrent change
+        by_status = Counter(doc.get("status", "new") for doc in batch)
+        await adjust_contact_counts(db, -result.deleted_count, {status: -count for status, count in by_status.items()})
+
+        if len(batch) < batch_size:
+            break
+        await asyncio.sleep(pause_seconds)
+
+    logger.info(f"Retention removed {removed} contact messages older than {retention_days} days")
+    return removed
+
+
+async def run_contact_retention(db: AsyncIOMotorClient, interval: float = CONTACT_RETENTION_INTERVAL_SECONDS):
+    """
+    Periodically apply the contact message retention policy
+    """
+    while True:
+        try:
+            await archive_old_contact_messages(db)
+        except Exception as e:
+            logger.error(f"Error applying contact retention: {str(e)}")
+        await asyncio.sleep(interval)
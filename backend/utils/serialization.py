@@ -0,0 +1,47 @@
+from bson import ObjectId
+from starlette.responses import JSONResponse
+from typing import Any
+import orjson
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode the BSON types orjson does not know about
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize to JSON bytes; datetimes are written natively in ISO 8601
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-backed JSON response, used as the app's default response class
+
+    Routes returning Mongo documents can hand them over as-is; ObjectId and
+    datetime values are encoded without a jsonable_encoder pass.
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class PreEncodedJSONResponse(JSONResponse):
+    """
+    Response for payloads already serialized to JSON bytes
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: bytes) -> bytes:
+        return content
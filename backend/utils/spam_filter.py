@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from utils.spam_model import get_spam_model
+
+logger = logging.getLogger(__name__)
+
+# Optional JSON file with a list of {"name", "pattern", "weight"} rules that
+# replaces the defaults below, and the score at which a message is spam.
+SPAM_RULES_FILE = os.environ.get("SPAM_RULES_FILE")
+SPAM_THRESHOLD = float(os.environ.get("SPAM_THRESHOLD", "1.0"))
+
+
+@dataclass(frozen=True)
+class SpamRule:
+    name: str
+    pattern: str
+    weight: float = 1.0
+
+
+@dataclass
+class SpamVerdict:
+    is_spam: bool
+    score: float
+    matched_rules: List[str] = field(default_factory=list)
+    unique_word_ratio: float = 1.0
+    # Set when a trained model made the decision
+    probability: Optional[float] = None
+
+
+DEFAULT_SPAM_RULES: Tuple[SpamRule, ...] = (
+    SpamRule("url", r"https?://(?:[a-z0-9$\-_@.&+!*(),/:;=?#~]|%[0-9a-f]{2})+"),
+    SpamRule("buy_now", r"buy now"),
+    SpamRule("click_here", r"click here"),
+    SpamRule("limited_time", r"limited time"),
+    SpamRule("free_money", r"free money"),
+    SpamRule("make_money_fast", r"make money fast"),
+    SpamRule("casino", r"casino"),
+    SpamRule("viagra", r"viagra"),
+    SpamRule("pills", r"pills"),
+)
+
+# Reported when fewer than ``repetition_ratio`` of the words are unique
+REPETITION_RULE = "repetition"
+
+# Rules made only of lowercase words and spaces are matched as plain phrases
+_PHRASE_RE = re.compile(r"[a-z0-9 ]+")
+
+
+class SpamClassifier:
+    """
+    Compiled spam scorer.
+
+    Rules are split once at construction: plain phrases are checked with
+    substring containment (CPython's fast search), and every regex rule is
+    compiled into one group-free alternation that is scanned in a single
+    ``finditer``. Hits from the alternation are attributed to a rule by
+    re-matching at the hit position. Word uniqueness is computed from the
+    same lowercased buffer.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[SpamRule] = DEFAULT_SPAM_RULES,
+        threshold: float = SPAM_THRESHOLD,
+        repetition_ratio: float = 0.3,
+        repetition_weight: float = 1.0,
+        repetition_min_words: int = 5,
+    ):
+        self.rules = tuple(rules)
+        self.threshold = threshold
+        self.repetition_ratio = repetition_ratio
+        self.repetition_weight = repetition_weight
+        self.repetition_min_words = repetition_min_words
+
+        self._phrases = [rule for rule in self.rules if _PHRASE_RE.fullmatch(rule.pattern)]
+        self._patterns = [(rule, re.compile(rule.pattern)) for rule in self.rules if rule not in self._phrases]
+        self._scanner = None
+        if self._patterns:
+            self._scanner = re.compile("|".join(f"(?:{rule.pattern})" for rule, _ in self._patterns))
+
+    def _rule_at(self, text: str, pos: int) -> Optional[SpamRule]:
+        for rule, pattern in self._patterns:
+            if pattern.match(text, pos):
+                return rule
+        return None
+
+    def classify(self, message: str, stop_at_threshold: bool = False) -> SpamVerdict:
+        """
+        Score a message and report the rules that matched
+
+        With ``stop_at_threshold`` scoring stops as soon as the message is
+        known to be spam, so ``matched_rules`` and ``unique_word_ratio`` may
+        be incomplete; use it when only ``is_spam`` is needed. Checks run
+        cheapest first: phrases, then the regex scan, then word repetition.
+        """
+        text = message.lower()
+        score = 0.0
+        matched: List[str] = []
+
+        def verdict(unique_ratio: float = 1.0) -> SpamVerdict:
+            return SpamVerdict(
+                is_spam=score >= self.threshold,
+                score=score,
+                matched_rules=matched,
+                unique_word_ratio=unique_ratio,
+            )
+
+        for rule in self._phrases:
+            if rule.pattern in text:
+                matched.append(rule.name)
+                score += rule.weight
+                if stop_at_threshold and score >= self.threshold:
+                    return verdict()
+
+        if self._scanner is not None:
+            for match in self._scanner.finditer(text):
+                rule = self._rule_at(text, match.start())
+                if rule is not None and rule.name not in matched:
+                    matched.append(rule.name)
+                    score += rule.weight
+                    if stop_at_threshold and score >= self.threshold:
+                        return verdict()
+
+        unique_ratio = 1.0
+        words = text.split()
+        if len(words) > self.repetition_min_words:
+            unique_ratio = len(set(words)) / len(words)
+            if unique_ratio < self.repetition_ratio:
+                matched.append(REPETITION_RULE)
+                score += self.repetition_weight
+
+        return verdict(unique_ratio)
+
+
+def load_spam_rules(path: Optional[str]) -> Tuple[SpamRule, ...]:
+    """
+    Load spam rules from a JSON file, falling back to the defaults
+    """
+    if not path:
+        return DEFAULT_SPAM_RULES
+
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+        rules = tuple(
+            SpamRule(entry["name"], entry["pattern"], float(entry.get("weight", 1.0)))
+            for entry in entries
+        )
+        for rule in rules:
+            re.compile(rule.pattern)
+        return rules
+    except Exception as e:
+        logger.error(f"Error loading spam rules from {path}: {str(e)}")
+        return DEFAULT_SPAM_RULES
+
+
+spam_classifier = SpamClassifier(load_spam_rules(SPAM_RULES_FILE))
+
+
+def classify_message(message: str, stop_at_threshold: bool = False) -> SpamVerdict:
+    """
+    Classify a message with the configured rule set
+
+    When a trained model is configured it makes the decision; matched
+    rules are still reported unless ``stop_at_threshold`` is set, in which
+    case only the model runs.
+    """
+    model = get_spam_model()
+    if model is not None and stop_at_threshold:
+        probability = model.probability(message)
+        return SpamVerdict(is_spam=probability >= model.threshold, score=0.0, probability=probability)
+
+    verdict = spam_classifier.classify(message, stop_at_threshold=stop_at_threshold)
+    if model is not None:
+        verdict.probability = model.probability(message)
+        verdict.is_spam = verdict.probability >= model.threshold
+    return verdict
@@ -0,0 +1,215 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+import logging
+import math
+import os
+import string
+import zlib
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Trained model (.npz) used instead of the keyword rules when set, and the
+# spam probability at which a message is rejected.
+SPAM_MODEL_FILE = os.environ.get("SPAM_MODEL_FILE")
+SPAM_MODEL_THRESHOLD = float(os.environ.get("SPAM_MODEL_THRESHOLD", "0.9"))
+SPAM_RESCORE_CHUNK_SIZE = int(os.environ.get("SPAM_RESCORE_CHUNK_SIZE", "1000"))
+
+# Hashed vocabulary size; a power of two so the bucket is a bit mask
+DEFAULT_FEATURE_BITS = 18
+# Admins label training examples by setting this boolean on contact messages
+SPAM_LABEL_FIELD = "spam_label"
+SPAM_SCORE_FIELD = "spam_score"
+
+# Punctuation splits words; translate + split is several times faster than a \w+ regex
+_SEPARATORS = str.maketrans({char: " " for char in string.punctuation})
+# Odd 32-bit multiplier mixing a word's hash into the hash of the pair it starts
+_PAIR_MULTIPLIER = 0x9E3779B1
+
+
+def _numpy():
+    # numpy is only needed once a model is trained or loaded, so it stays
+    # out of the API's import path otherwise
+    import numpy
+    return numpy
+
+
+def hashed_features(text: str, mask: int) -> List[int]:
+    """
+    Distinct feature indices of ``text`` in a vocabulary of ``mask + 1`` hashed buckets
+
+    Features are the words and adjacent word pairs, which let the model
+    tell "click here to buy" from "click here for my GitHub" where single
+    keywords cannot. Pair hashes are combined from the word hashes rather
+    than by hashing the joined strings.
+    """
+    words = text.lower().translate(_SEPARATORS).split()
+    hashes = [zlib.crc32(word.encode()) for word in words]
+    features = {value & mask for value in hashes}
+    features.update([(first * _PAIR_MULTIPLIER ^ second) & mask for first, second in zip(hashes, hashes[1:])])
+    return list(features)
+
+
+class SpamModel:
+    """
+    Naive Bayes spam scorer over a hashed vocabulary
+
+    A message's log-odds of being spam is ``bias`` plus the sum of the
+    per-feature log-likelihood ratios in ``weights`` for the features it
+    contains, so scoring is a gather and a sum; batches are scored with a
+    single ``add.reduceat`` over the concatenated feature indices.
+    """
+
+    def __init__(self, weights: "np.ndarray", bias: float, threshold: float = SPAM_MODEL_THRESHOLD):
+        self.weights = weights
+        self.bias = float(bias)
+        self.threshold = threshold
+        self.mask = len(weights) - 1
+        # Plain list for single-message scoring, where numpy call overhead would dominate
+        self._weights_list = weights.tolist()
+
+    def log_odds(self, text: str) -> float:
+        weights = self._weights_list
+        return self.bias + sum(weights[index] for index in hashed_features(text, self.mask))
+
+    def probability(self, text: str) -> float:
+        log_odds = self.log_odds(text)
+        # Numerically stable logistic
+        if log_odds >= 0:
+            return 1.0 / (1.0 + math.exp(-log_odds))
+        odds = math.exp(log_odds)
+        return odds / (1.0 + odds)
+
+    def is_spam(self, text: str) -> bool:
+        return self.probability(text) >= self.threshold
+
+    def probabilities(self, texts: Sequence[str]) -> "np.ndarray":
+        """
+        Spam probabilities for many messages in one vectorized pass
+        """
+        np = _numpy()
+        if not texts:
+            return np.zeros(0, dtype=np.float64)
+        features = [hashed_features(text, self.mask) for text in texts]
+        lengths = np.fromiter(map(len, features), dtype=np.int64, count=len(features))
+        flat = np.fromiter(chain.from_iterable(features), dtype=np.int64, count=int(lengths.sum()))
+
+        log_odds = np.full(len(texts), self.bias, dtype=np.float64)
+        non_empty = lengths > 0
+        if flat.size:
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            sums = np.add.reduceat(self.weights[flat].astype(np.float64), offsets[non_empty])
+            log_odds[non_empty] += sums
+        # Clipped so exp() cannot overflow on very confident scores
+        return 1.0 / (1.0 + np.exp(-np.clip(log_odds, -500.0, 500.0)))
+
+    def save(self, path: str):
+        np = _numpy()
+        np.savez_compressed(path, weights=self.weights, bias=np.array(self.bias))
+
+    @classmethod
+    def load(cls, path: str, threshold: float = SPAM_MODEL_THRESHOLD) -> "SpamModel":
+        np = _numpy()
+        with np.load(path) as data:
+            return cls(data["weights"], float(data["bias"]), threshold)
+
+
+def train_spam_model(
+    texts: Iterable[str],
+    labels: Iterable[bool],
+    feature_bits: int = DEFAULT_FEATURE_BITS,
+    alpha: float = 1.0,
+) -> SpamModel:
+    """
+    Fit a multinomial naive Bayes model on binarized hashed features
+    Raises ValueError unless both spam and legitimate examples are given
+    """
+    np = _numpy()
+    size = 1 << feature_bits
+    mask = size - 1
+    counts = {True: np.zeros(size, dtype=np.float64), False: np.zeros(size, dtype=np.float64)}
+    documents = {True: 0, False: 0}
+    for text, label in zip(texts, labels):
+        label = bool(label)
+        indices = np.fromiter(hashed_features(text, mask), dtype=np.int64)
+        counts[label] += np.bincount(indices, minlength=size)
+        documents[label] += 1
+
+    if not documents[True] or not documents[False]:
+        raise ValueError("Training needs both spam and legitimate examples")
+
+    log_spam = np.log((counts[True] + alpha) / (counts[True].sum() + alpha * size))
+    log_ham = np.log((counts[False] + alpha) / (counts[False].sum() + alpha * size))
+    weights = (log_spam - log_ham).astype(np.float32)
+    bias = float(np.log(documents[True] / documents[False]))
+    return SpamModel(weights, bias)
+
+
+async def load_training_data(db: AsyncIOMotorClient) -> Tuple[List[str], List[bool]]:
+    """
+    Labeled contact messages, as (message bodies, is-spam labels)
+    """
+    texts: List[str] = []
+    labels: List[bool] = []
+    cursor = db.contact_messages.find(
+        {SPAM_LABEL_FIELD: {"$in": [True, False]}},
+        {"_id": 0, "message": 1, SPAM_LABEL_FIELD: 1}
+    )
+    async for doc in cursor:
+        texts.append(doc.get("message", ""))
+        labels.append(doc[SPAM_LABEL_FIELD])
+    return texts, labels
+
+
+async def rescore_contact_messages(db: AsyncIOMotorClient, model: SpamModel, chunk_size: int = SPAM_RESCORE_CHUNK_SIZE) -> int:
+    """
+    Score every stored contact message in chunks and write back ``spam_score``
+    Returns the number of messages scored.
+    """
+    scored = 0
+    cursor = db.contact_messages.find({}, {"_id": 1, "message": 1}).batch_size(chunk_size)
+    chunk: List[dict] = []
+
+    async def flush():
+        nonlocal scored
+        probabilities = model.probabilities([doc.get("message", "") for doc in chunk])
+        await db.contact_messages.bulk_write(
+            [UpdateOne({"_id": doc["_id"]}, {"$set": {SPAM_SCORE_FIELD: float(p)}}) for doc, p in zip(chunk, probabilities)],
+            ordered=False
+        )
+        scored += len(chunk)
+        chunk.clear()
+
+    async for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= chunk_size:
+            await flush()
+    if chunk:
+        await flush()
+
+    logger.info(f"Rescored {scored} contact messages")
+    return scored
+
+
+_spam_model: Optional[SpamModel] = None
+_spam_model_loaded = False
+
+
+def get_spam_model() -> Optional[SpamModel]:
+    """
+    The configured model, loaded on first use; None when none is configured
+    """
+    global _spam_model, _spam_model_loaded
+    if not _spam_model_loaded:
+        _spam_model_loaded = True
+        if SPAM_MODEL_FILE:
+            try:
+                _spam_model = SpamModel.load(SPAM_MODEL_FILE)
+                logger.info(f"Loaded spam model from {SPAM_MODEL_FILE}")
+            except Exception as e:
+                logger.error(f"Error loading spam model from {SPAM_MODEL_FILE}: {str(e)}")
+    return _spam_model
@@ -0,0 +1,242 @@
+from dataclasses import dataclass, field
+from fastapi import Request, Response
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from utils.http_cache import RangeNotSatisfiable, http_date, is_not_modified, make_etag, parse_range, range_applies
+import asyncio
+import gzip
+import logging
+import mimetypes
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli variants are skipped when the package is missing
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+STATIC_CACHE_MAX_BYTES = int(os.environ.get("STATIC_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+STATIC_CACHE_POLL_SECONDS = float(os.environ.get("STATIC_CACHE_POLL_SECONDS", "5"))
+STATIC_CACHE_CONTROL = f"public, max-age={int(os.environ.get('STATIC_CACHE_MAX_AGE', '86400'))}"
+
+# Compressed variants are only kept when they save at least this fraction
+MIN_COMPRESSION_SAVING = 0.05
+
+
+@dataclass
+class StaticAsset:
+    path: str
+    content: bytes
+    media_type: str
+    etag: str
+    last_modified: float
+    mtime_ns: int
+    variants: Dict[str, bytes] = field(default_factory=dict)
+    hits: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.content) + sum(len(data) for data in self.variants.values())
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Pick the smallest precompressed variant the client accepts
+        """
+        accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return self.variants[encoding], encoding
+        return self.content, None
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Strong validators must differ between representations
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+
+def asset_from_bytes(path: str, content: bytes, media_type: str, last_modified: float, mtime_ns: int) -> StaticAsset:
+    """
+    Precompute validators and compressed variants for in-memory content
+    """
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content)
+    variants = {
+        encoding: data for encoding, data in variants.items()
+        if len(data) <= len(content) * (1 - MIN_COMPRESSION_SAVING)
+    }
+
+    return StaticAsset(
+        path=path,
+        content=content,
+        media_type=media_type,
+        etag=make_etag(content),
+        last_modified=last_modified,
+        mtime_ns=mtime_ns,
+        variants=variants,
+    )
+
+
+def build_asset(root: Path, file_path: Path) -> StaticAsset:
+    """
+    Read a file and precompute its validators and compressed variants
+    """
+    stat = file_path.stat()
+    return asset_from_bytes(
+        file_path.relative_to(root).as_posix(),
+        file_path.read_bytes(),
+        mimetypes.guess_type(file_path.name)[0] or "application/octet-stream",
+        stat.st_mtime,
+        stat.st_mtime_ns,
+    )
+
+
+class StaticAssetCache:
+    """
+    Files under ``root`` held in memory with gzip/brotli variants.
+
+    Assets are admitted smallest first until ``max_bytes`` (counting all
+    variants) is reached. A polling task re-stats the directory every
+    ``poll_interval`` seconds and swaps in changed files, so requests never
+    touch the filesystem.
+    """
+
+    def __init__(self, root: Path = STATIC_DIR, max_bytes: int = STATIC_CACHE_MAX_BYTES, poll_interval: float = STATIC_CACHE_POLL_SECONDS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self._assets: Dict[str, StaticAsset] = {}
+        self._mtimes: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.unknown_misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(asset.nbytes for asset in self._assets.values())
+
+    def _scan(self) -> Dict[str, Tuple[Path, int, int]]:
+        found = {}
+        if not self.root.exists():
+            return found
+        for file_path in self.root.rglob("*"):
+            if file_path.is_file():
+                stat = file_path.stat()
+                found[file_path.relative_to(self.root).as_posix()] = (file_path, stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def refresh(self) -> bool:
+        """
+        Reload files whose mtime changed; returns True if anything changed
+        """
+        found = self._scan()
+        current = {path: mtime for path, (_, mtime, _) in found.items()}
+        if current == self._mtimes:
+            return False
+
+        assets: Dict[str, StaticAsset] = {}
+        used = 0
+        for path, (file_path, mtime_ns, size) in sorted(found.items(), key=lambda item: item[1][2]):
+            asset = self._assets.get(path)
+            if asset is None or asset.mtime_ns != mtime_ns:
+                if used + size > self.max_bytes:
+                    continue
+                try:
+                    asset = build_asset(self.root, file_path)
+                except OSError as e:
+                    logger.error(f"Error loading static asset {path}: {str(e)}")
+                    continue
+            if used + asset.nbytes > self.max_bytes:
+                logger.warning(f"Static asset {path} not cached: memory cap of {self.max_bytes} bytes reached")
+                continue
+            assets[path] = asset
+            used += asset.nbytes
+
+        # Swap in one assignment so readers never see a partial reload
+        self._assets = assets
+        self._mtimes = current
+        self.misses = {path: count for path, count in self.misses.items() if path in found}
+        logger.info(f"Static asset cache holds {len(assets)} files ({used} bytes)")
+        return True
+
+    def known(self, path: str) -> bool:
+        return path in self._mtimes
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        asset = self._assets.get(path)
+        if asset is not None:
+            asset.hits += 1
+        elif path in self._mtimes:
+            self.misses[path] = self.misses.get(path, 0) + 1
+        else:
+            self.unknown_misses += 1
+        return asset
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "assets": {
+                path: {"bytes": asset.nbytes, "hits": asset.hits, "variants": sorted(asset.variants)}
+                for path, asset in self._assets.items()
+            },
+            "misses": dict(self.misses),
+            "unknown_misses": self.unknown_misses,
+        }
+
+    async def run_polling(self):
+        """
+        Reload changed files every ``poll_interval`` seconds
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Error refreshing static asset cache: {str(e)}")
+
+
+static_cache = StaticAssetCache()
+
+
+def asset_response(request: Request, asset: StaticAsset, cache_control: str = STATIC_CACHE_CONTROL, filename: Optional[str] = None) -> Response:
+    """
+    Serve a cached asset, handling conditional requests, ranges and content negotiation
+    """
+    # Ranges are only served over the identity encoding
+    wants_range = "range" in request.headers
+    if wants_range:
+        content, encoding = asset.content, None
+    else:
+        content, encoding = asset.select(request.headers.get("accept-encoding", ""))
+    etag = asset.etag_for(encoding)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(asset.last_modified),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+
+    if is_not_modified(request.headers, etag, asset.last_modified):
+        return Response(status_code=304, headers=headers)
+
+    status_code = 200
+    if wants_range and range_applies(request.headers, etag):
+        try:
+            byte_range = parse_range(request.headers.get("range"), len(content))
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{len(content)}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            content = content[start:end + 1]
+            status_code = 206
+
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return Response(content=content, status_code=status_code, media_type=asset.media_type, headers=headers)
@@ -1,6 +1,8 @@
 import re
 from fastapi import Request
 from models.contact import ContactMessageCreate
+from utils.spam_filter import classify_message
+from utils.metrics import SPAM_REJECTIONS
 from typing import Optional
 
 def validate_contact_message(contact_data: ContactMessageCreate) -> bool:
@@ -8,18 +10,10 @@ def validate_contact_message(contact_data: ContactMessageCreate) -> bool:
     Validate contact message data
     """
     try:
-        # Basic validation (Pydantic handles most of this)
-        if not contact_data.name.strip():
-            return False
-        
-        if not contact_data.subject.strip():
-            return False
-            
-        if not contact_data.message.strip():
-            return False
-        
+        # Fields arrive stripped and non-empty from ContactMessageCreate's validators
         # Check for potential spam patterns
         if is_spam_message(contact_data.message):
+            SPAM_REJECTIONS.inc()
             return False
             
         return True
@@ -29,34 +23,9 @@ def validate_contact_message(contact_data: ContactMessageCreate) -> bool:
 
 def is_spam_message(message: str) -> bool:
     """
-    Basic spam detection
+    Spam detection using the compiled classifier, stopping at the first decisive hit
     """
-    spam_patterns = [
-        r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
-        r'buy now',
-        r'click here',
-        r'limited time',
-        r'free money',
-        r'make money fast',
-        r'casino',
-        r'viagra',
-        r'pills'
-    ]
-    
-    message_lower = message.lower()
-    
-    for pattern in spam_patterns:
-        if re.search(pattern, message_lower):
-            return True
-    
-    # Check for excessive repetition
-    words = message_lower.split()
-    if len(words) > 5:
-        unique_words = set(words)
-        if len(unique_words) < len(words) * 0.3:  # Less than 30% unique words
-            return True
-    
-    return False
+    return classify_message(message, stop_at_threshold=True).is_spam
 
 def get_client_ip(request: Request) -> str:
     """
@@ -0,0 +1,54 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Read at import time by the backend modules
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ.setdefault("MONGO_WARMUP", "false")
+os.environ.setdefault("ADMIN_API_TOKEN", "test-admin-token")
+
+import httpx  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def admin_headers():
+    return {"X-Admin-Token": os.environ["ADMIN_API_TOKEN"]}
+
+
+@pytest.fixture
+def mongo():
+    return AsyncMongoMockClient()
+
+
+@pytest.fixture
+async def client(mongo):
+    """
+    httpx client bound to the full app, started against mongomock
+    """
+    from server import create_app
+    from utils.counters import stats_cache
+    from utils.dedup import contact_dedup
+    from utils.rate_limiter import _memory_limiters
+    from utils.response_cache import response_cache
+
+    # Process-wide state would otherwise leak between tests
+    response_cache.clear()
+    contact_dedup.index = type(contact_dedup.index)()
+    _memory_limiters.clear()
+    stats_cache.invalidate()
+
+    app = create_app(mongo_client=mongo)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            yield http
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+from fastapi.routing import APIRoute
+
+pytestmark = pytest.mark.anyio
+
+SUBMISSION = {
+    "name": "Ada",
+    "email": "ada@example.com",
+    "subject": "Backend contract",
+    "message": "Interested in hiring you for a backend contract building payment integrations next quarter",
+}
+
+
+def admin_routes():
+    from server import create_app
+    for route in create_app().routes:
+        if isinstance(route, APIRoute) and route.path.startswith("/api/admin"):
+            for method in route.methods:
+                yield method, route.path.replace("{contact_id}", "missing")
+
+
+ADMIN_ROUTES = sorted(admin_routes())
+
+
+def test_admin_surface_includes_diagnostics():
+    paths = {path for _, path in ADMIN_ROUTES}
+    assert {"/api/admin/contacts", "/api/admin/stats", "/api/admin/indexes", "/api/admin/response-cache"} <= paths
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ROUTES)
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+async def test_admin_routes_require_the_token(client, method, path, headers):
+    response = await client.request(method, path, headers=headers)
+    assert response.status_code == 401
+
+
+async def test_admin_can_read_submitted_messages(client, mongo, admin_headers):
+    assert (await client.post("/api/contact", json=SUBMISSION)).status_code == 200
+    # The listing's $substrCP preview is not implemented by mongomock
+    stored = await mongo[os.environ["DB_NAME"]].contact_messages.find_one({})
+
+    detail = await client.get(f"/api/admin/contacts/{stored['id']}", headers=admin_headers)
+    assert detail.status_code == 200
+    assert detail.json()["message"] == SUBMISSION["message"]
+
+
+async def test_repeated_submission_is_rejected(client):
+    assert (await client.post("/api/contact", json=SUBMISSION)).status_code == 200
+    repeat = await client.post("/api/contact", json={**SUBMISSION, "email": "someone@example.com"})
+    assert repeat.status_code == 409
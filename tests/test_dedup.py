@@ -0,0 +1,78 @@
+from utils.dedup import MinHashIndex, NearDuplicateDetector, minhash, words
+
+MESSAGE = "Interested in hiring you for a backend contract building payment integrations next quarter"
+
+
+def signature(text):
+    return minhash(words(text))
+
+
+def test_words_drops_stopwords_and_repeats():
+    assert words("Hi, I would like the the quote for your design work") == ["like", "quote", "design", "work"]
+
+
+def test_identical_text_matches():
+    index = MinHashIndex(window_seconds=60)
+    index.add("a", signature(MESSAGE), now=0)
+
+    assert index.most_similar(signature(MESSAGE), now=1) == ("a", 1.0)
+    assert index.most_similar(signature("Completely unrelated note about gardening tools and tomato seeds"), now=1) is None
+
+
+def test_oldest_entry_evicted_at_max_entries():
+    index = MinHashIndex(max_entries=2, window_seconds=60)
+    index.add("a", signature(MESSAGE), now=0)
+    index.add("b", signature("Question about speaking at our conference on distributed systems"), now=1)
+    index.add("c", signature("Feedback on your open source library documentation and examples"), now=2)
+
+    assert len(index) == 2
+    assert index.most_similar(signature(MESSAGE), now=3) is None
+
+
+def test_entries_expire_after_the_window():
+    index = MinHashIndex(window_seconds=60)
+    index.add("a", signature(MESSAGE), now=0)
+
+    assert index.most_similar(signature(MESSAGE), now=59)[0] == "a"
+    assert index.most_similar(signature(MESSAGE), now=61) is None
+    assert len(index) == 0
+
+
+def test_discard_removes_entry_from_lookups():
+    index = MinHashIndex(window_seconds=60)
+    index.add("a", signature(MESSAGE), now=0)
+    index.discard("a")
+    index.discard("missing")
+
+    assert len(index) == 0
+    assert index.most_similar(signature(MESSAGE), now=1) is None
+    assert all(not table for table in index._tables)
+
+
+def test_re_adding_a_key_replaces_its_signature():
+    other = "Question about speaking at our conference on distributed systems"
+    index = MinHashIndex(window_seconds=60)
+    index.add("a", signature(MESSAGE), now=0)
+    index.add("a", signature(other), now=1)
+
+    assert len(index) == 1
+    assert index.most_similar(signature(MESSAGE), now=2) is None
+    assert index.most_similar(signature(other), now=2)[0] == "a"
+
+
+def test_detector_check_and_discard():
+    detector = NearDuplicateDetector(mode="reject", index=MinHashIndex(window_seconds=60))
+
+    assert detector.check_and_add("first", "Contract work", MESSAGE) is None
+    match = detector.check_and_add("second", "Contract work", MESSAGE)
+    assert match.key == "first" and match.similarity == 1.0
+
+    detector.discard("first")
+    assert detector.check_and_add("third", "Contract work", MESSAGE) is None
+
+
+def test_detector_skips_short_messages():
+    detector = NearDuplicateDetector(mode="reject", index=MinHashIndex(window_seconds=60))
+    assert detector.check_and_add("a", "Hi", "Are you available?") is None
+    assert detector.check_and_add("b", "Hi", "Are you available?") is None
+    assert len(detector.index) == 0
@@ -0,0 +1,64 @@
+import pytest
+
+from utils.http_cache import RangeNotSatisfiable, http_date, is_not_modified, make_etag, parse_range, range_applies
+
+SIZE = 10
+ETAG = make_etag(b"content")
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "items=0-4",
+    "bytes=0-1,4-5",
+    "bytes=abc",
+    "bytes=a-4",
+    "bytes=5-3",
+])
+def test_parse_range_sends_the_whole_body(header):
+    assert parse_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("bytes=2-4", (2, 4)),
+    ("bytes=3-", (3, 9)),
+    ("bytes=-4", (6, 9)),
+    ("bytes=-50", (0, 9)),
+    ("bytes=5-500", (5, 9)),
+    ("bytes=9-9", (9, 9)),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=10-20", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, SIZE)
+
+
+def test_if_none_match():
+    assert is_not_modified({"if-none-match": ETAG}, ETAG)
+    assert is_not_modified({"if-none-match": f'"other", W/{ETAG}'}, ETAG)
+    assert is_not_modified({"if-none-match": "*"}, ETAG)
+    assert not is_not_modified({"if-none-match": '"other"'}, ETAG)
+    assert not is_not_modified({}, ETAG)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = {"if-none-match": '"other"', "if-modified-since": http_date(2000)}
+    assert not is_not_modified(headers, ETAG, last_modified=1000)
+
+
+def test_if_modified_since():
+    assert is_not_modified({"if-modified-since": http_date(1000)}, ETAG, last_modified=1000)
+    assert is_not_modified({"if-modified-since": http_date(2000)}, ETAG, last_modified=1000.5)
+    assert not is_not_modified({"if-modified-since": http_date(1000)}, ETAG, last_modified=2000)
+    assert not is_not_modified({"if-modified-since": "not a date"}, ETAG, last_modified=1000)
+    assert not is_not_modified({"if-modified-since": http_date(1000)}, ETAG)
+
+
+def test_range_applies():
+    assert range_applies({}, ETAG)
+    assert range_applies({"if-range": ETAG}, ETAG)
+    assert not range_applies({"if-range": '"stale"'}, ETAG)
@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from utils.ingestion import WriteBehindQueue
+
+pytestmark = pytest.mark.anyio
+
+COLLECTION = "messages"
+
+
+class FlakyDatabase:
+    """
+    Wraps a mongomock database, failing insert_many with scripted errors
+    before handing calls through
+    """
+
+    def __init__(self, db, failures=()):
+        self.db = db
+        self.failures = list(failures)
+        self.batches = []
+
+    def __getitem__(self, name):
+        return self
+
+    async def insert_many(self, documents, ordered=True):
+        self.batches.append([document["id"] for document in documents])
+        failure = self.failures.pop(0) if self.failures else None
+        if failure is not None:
+            if isinstance(failure, BulkWriteError):
+                # Whatever the error did not cover was written
+                failed = {error["index"] for error in failure.details["writeErrors"]}
+                written = [document for index, document in enumerate(documents) if index not in failed]
+                if written:
+                    await self.db[COLLECTION].insert_many(written)
+            raise failure
+        return await self.db[COLLECTION].insert_many(documents, ordered=ordered)
+
+
+def write_error(*codes_by_index):
+    return BulkWriteError({
+        "writeErrors": [
+            {"index": index, "code": code, "errmsg": "write failed"} for index, code in codes_by_index
+        ],
+    })
+
+
+def documents(*ids):
+    return [{"id": doc_id} for doc_id in ids]
+
+
+def make_queue(**kwargs):
+    stored, not_stored = [], []
+
+    async def on_flush(db, docs):
+        stored.extend(document["id"] for document in docs)
+
+    async def on_failure(db, docs):
+        not_stored.extend(document["id"] for document in docs)
+
+    kwargs.setdefault("flush_interval", 0.01)
+    kwargs.setdefault("retry_backoff", 0.01)
+    queue = WriteBehindQueue(COLLECTION, on_flush=on_flush, on_failure=on_failure, **kwargs)
+    return queue, stored, not_stored
+
+
+async def stored_ids(mongo):
+    return sorted(document["id"] for document in await mongo.test[COLLECTION].find().to_list(None))
+
+
+async def test_drain_stores_everything(mongo):
+    queue, stored, not_stored = make_queue(batch_size=3)
+    queue.start(FlakyDatabase(mongo.test))
+    for document in documents(*"abcdefg"):
+        assert queue.enqueue(document)
+
+    await queue.drain()
+
+    assert await stored_ids(mongo) == list("abcdefg")
+    assert sorted(stored) == list("abcdefg")
+    assert not_stored == []
+    assert queue.flushed == 7 and queue.failed == 0
+    assert not queue.running
+
+
+async def test_enqueue_refused_when_not_running_or_full(mongo):
+    queue, _, _ = make_queue(max_size=2, flush_interval=60)
+    assert not queue.enqueue({"id": "early"})
+
+    queue.start(FlakyDatabase(mongo.test))
+    # The worker takes the first document off the queue, then waits for more
+    assert queue.enqueue({"id": "a"})
+    await asyncio.sleep(0)
+    assert queue.enqueue({"id": "b"})
+    assert queue.enqueue({"id": "c"})
+    assert not queue.enqueue({"id": "d"})
+
+    await queue.drain(timeout=0.05)
+    assert not queue.enqueue({"id": "late"})
+
+
+async def test_failed_batch_retried_ahead_of_newer_documents(mongo):
+    db = FlakyDatabase(mongo.test, failures=[AutoReconnect("primary stepped down"), AutoReconnect("still down")])
+    queue, stored, not_stored = make_queue()
+    queue.start(db)
+    for document in documents("a", "b"):
+        queue.enqueue(document)
+    await asyncio.sleep(0.02)
+    queue.enqueue({"id": "c"})
+
+    await queue.drain()
+
+    assert db.batches == [["a", "b"], ["a", "b"], ["a", "b"], ["c"]]
+    assert await stored_ids(mongo) == ["a", "b", "c"]
+    assert stored == ["a", "b", "c"]
+    assert not_stored == []
+    assert queue.retried == 4 and queue.failed == 0
+
+
+async def test_only_failed_documents_of_a_partial_write_are_retried(mongo):
+    # A write concern timeout for "b"; "a" and "c" were written
+    db = FlakyDatabase(mongo.test, failures=[write_error((1, 64))])
+    queue, stored, _ = make_queue()
+    queue.start(db)
+    for document in documents("a", "b", "c"):
+        queue.enqueue(document)
+
+    await queue.drain()
+
+    assert db.batches == [["a", "b", "c"], ["b"]]
+    assert await stored_ids(mongo) == ["a", "b", "c"]
+    assert sorted(stored) == ["a", "b", "c"]
+
+
+async def test_non_retryable_write_error_gives_up(mongo, caplog):
+    # "b" fails document validation
+    db = FlakyDatabase(mongo.test, failures=[write_error((1, 121))])
+    queue, stored, not_stored = make_queue()
+    queue.start(db)
+    for document in documents("a", "b", "c"):
+        queue.enqueue(document)
+
+    await queue.drain()
+
+    assert db.batches == [["a", "b", "c"]]
+    assert await stored_ids(mongo) == ["a", "c"]
+    assert sorted(stored) == ["a", "c"]
+    assert not_stored == ["b"]
+    assert queue.failed == 1
+    assert any("b" in record.getMessage() and record.levelname == "ERROR" for record in caplog.records)
+
+
+async def test_duplicate_key_on_retry_counts_as_stored(mongo):
+    class LostAckDatabase(FlakyDatabase):
+        """
+        Writes the first batch but reports a network error, as when the
+        acknowledgement is lost
+        """
+
+        async def insert_many(self, docs, ordered=True):
+            self.batches.append([document["id"] for document in docs])
+            if len(self.batches) == 1:
+                await mongo.test[COLLECTION].insert_many(docs)
+                raise AutoReconnect("connection reset")
+            raise write_error(*((index, 11000) for index in range(len(docs))))
+
+    db = LostAckDatabase(mongo.test)
+    queue, stored, not_stored = make_queue()
+    queue.start(db)
+    queue.enqueue({"id": "a"})
+
+    await queue.drain()
+
+    assert db.batches == [["a"], ["a"]]
+    assert await stored_ids(mongo) == ["a"]
+    assert stored == ["a"]
+    assert not_stored == [] and queue.failed == 0
+
+
+async def test_drain_timeout_reports_what_was_not_stored(mongo):
+    db = FlakyDatabase(mongo.test, failures=[AutoReconnect("down")] * 100)
+    queue, stored, not_stored = make_queue(retry_backoff=0.01, retry_backoff_max=0.01)
+    queue.start(db)
+    for document in documents("a", "b"):
+        queue.enqueue(document)
+
+    await queue.drain(timeout=0.1)
+
+    assert stored == []
+    assert sorted(not_stored) == ["a", "b"]
+    assert not queue.running
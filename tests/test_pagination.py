@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.pagination import (
+    KEYSET_SORT,
+    SCORE_FIELD,
+    decode_cursor,
+    decode_ranked_cursor,
+    encode_cursor,
+    encode_ranked_cursor,
+    keyset_filter,
+    next_cursor,
+    ranked_keyset_filter,
+)
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"timestamp": NOW, "id": "abc"})
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (NOW, "abc")
+
+
+def test_ranked_cursor_round_trip():
+    cursor = encode_ranked_cursor({SCORE_FIELD: 1.5, "timestamp": NOW, "id": "abc"})
+    assert decode_ranked_cursor(cursor) == (1.5, NOW, "abc")
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "e30", encode_cursor({"timestamp": NOW, "id": "x"})[:-3]])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    with pytest.raises(ValueError):
+        decode_ranked_cursor(cursor)
+
+
+def test_keyset_filter():
+    assert keyset_filter(None) == {}
+    assert keyset_filter(encode_cursor({"timestamp": NOW, "id": "b"})) == {
+        "$or": [
+            {"timestamp": {"$lt": NOW}},
+            {"timestamp": NOW, "id": {"$lt": "b"}},
+        ]
+    }
+
+
+def test_ranked_keyset_filter():
+    assert ranked_keyset_filter(None) == {}
+    cursor = encode_ranked_cursor({SCORE_FIELD: 2.0, "timestamp": NOW, "id": "b"})
+    assert ranked_keyset_filter(cursor) == {
+        "$or": [
+            {SCORE_FIELD: {"$lt": 2.0}},
+            {SCORE_FIELD: 2.0, "timestamp": {"$lt": NOW}},
+            {SCORE_FIELD: 2.0, "timestamp": NOW, "id": {"$lt": "b"}},
+        ]
+    }
+
+
+def test_next_cursor():
+    page = [{"timestamp": NOW, "id": "a"}, {"timestamp": NOW, "id": "b"}]
+    assert next_cursor(page, limit=3) is None
+    assert next_cursor([], limit=0) is None
+    assert decode_cursor(next_cursor(page, limit=2)) == (NOW, "b")
+
+    ranked = [{SCORE_FIELD: 1.0, "timestamp": NOW, "id": "a"}]
+    assert decode_ranked_cursor(next_cursor(ranked, limit=1, ranked=True)) == (1.0, NOW, "a")
+
+
+async def collect_pages(collection, limit, ranked=False):
+    seen, cursor = [], None
+    while True:
+        build = ranked_keyset_filter if ranked else keyset_filter
+        sort = [(SCORE_FIELD, -1)] + KEYSET_SORT if ranked else KEYSET_SORT
+        page = await collection.find(build(cursor), {"_id": 0}).sort(sort).limit(limit).to_list(limit)
+        seen.extend(page)
+        cursor = next_cursor(page, limit, ranked=ranked)
+        if cursor is None:
+            return seen
+
+
+async def test_keyset_pages_have_no_gaps_or_repeats(mongo):
+    collection = mongo.test.messages
+    # Pairs of documents share a timestamp so the id tie-breaker is exercised
+    docs = [{"id": f"{i:03d}", "timestamp": NOW - timedelta(minutes=i // 2)} for i in range(25)]
+    await collection.insert_many(docs)
+
+    for limit in (1, 4, 5, 30):
+        seen = await collect_pages(collection, limit)
+        assert [doc["id"] for doc in seen] == [
+            doc["id"] for doc in sorted(docs, key=lambda d: (d["timestamp"], d["id"]), reverse=True)
+        ]
+
+
+async def test_ranked_pages_have_no_gaps_or_repeats(mongo):
+    collection = mongo.test.results
+    docs = [
+        {"id": f"{i:03d}", SCORE_FIELD: float(i % 3), "timestamp": NOW - timedelta(minutes=i % 2)}
+        for i in range(20)
+    ]
+    await collection.insert_many(docs)
+
+    seen = await collect_pages(collection, limit=3, ranked=True)
+    expected = sorted(docs, key=lambda d: (d[SCORE_FIELD], d["timestamp"], d["id"]), reverse=True)
+    assert [doc["id"] for doc in seen] == [doc["id"] for doc in expected]
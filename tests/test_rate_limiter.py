@@ -0,0 +1,45 @@
+from utils.rate_limiter import SlidingWindowRateLimiter
+
+
+def test_allows_max_requests_then_rejects():
+    limiter = SlidingWindowRateLimiter(max_requests=3, window_seconds=60)
+    assert [limiter.hit("ip", now=t) for t in (0, 1, 2, 3)] == [True, True, True, False]
+
+
+def test_window_slides():
+    limiter = SlidingWindowRateLimiter(max_requests=2, window_seconds=60)
+    assert limiter.hit("ip", now=0)
+    assert limiter.hit("ip", now=30)
+    assert not limiter.hit("ip", now=59)
+    # The first hit has left the window, the second has not
+    assert limiter.hit("ip", now=60)
+    assert not limiter.hit("ip", now=61)
+    assert limiter.hit("ip", now=91)
+
+
+def test_rejected_requests_do_not_extend_the_window():
+    limiter = SlidingWindowRateLimiter(max_requests=1, window_seconds=60)
+    assert limiter.hit("ip", now=0)
+    for t in range(1, 60):
+        assert not limiter.hit("ip", now=t)
+    assert limiter.hit("ip", now=60)
+
+
+def test_keys_are_independent():
+    limiter = SlidingWindowRateLimiter(max_requests=1, window_seconds=60)
+    assert limiter.hit("a", now=0)
+    assert limiter.hit("b", now=0)
+    assert not limiter.hit("a", now=1)
+
+
+def test_least_recently_seen_key_evicted():
+    limiter = SlidingWindowRateLimiter(max_requests=1, window_seconds=60, max_entries=2)
+    limiter.hit("a", now=0)
+    limiter.hit("b", now=0)
+    limiter.hit("a", now=1)
+    limiter.hit("c", now=2)
+
+    assert len(limiter) == 2
+    # "b" was evicted, so it starts afresh; "a" is still limited
+    assert limiter.hit("b", now=3)
+    assert not limiter.hit("c", now=3)
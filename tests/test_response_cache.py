@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from utils.metrics import HTTP_REQUESTS, MetricsMiddleware
+from utils.response_cache import CachedResponse, ResponseCache, ResponseCacheMiddleware, cache_response
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENCY = 50
+
+
+def build_app(cache: ResponseCache, ttl: float, stale_ttl: float = 0.0):
+    app = FastAPI()
+    app.state.runs = 0
+
+    @app.get("/cached")
+    @cache_response(ttl=ttl, stale_ttl=stale_ttl, tags=("things",))
+    async def cached():
+        app.state.runs += 1
+        # Long enough for every concurrent request to arrive while it runs
+        await asyncio.sleep(0.05)
+        return {"run": app.state.runs}
+
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, enabled=True)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def client_for(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def entry(tags=("things",)):
+    return CachedResponse(status=200, headers=[], body=b"{}", tags=tags, stored_at=0.0, fresh_until=1.0, stale_until=1.0)
+
+
+async def test_concurrent_misses_run_the_route_once():
+    app = build_app(ResponseCache(), ttl=60)
+    async with client_for(app) as client:
+        responses = await asyncio.gather(*(client.get("/cached") for _ in range(CONCURRENCY)))
+
+    assert app.state.runs == 1
+    assert {response.json()["run"] for response in responses} == {1}
+    assert sorted(response.headers["x-cache"] for response in responses).count("MISS") == 1
+
+
+async def test_concurrent_stale_hits_refresh_once():
+    app = build_app(ResponseCache(), ttl=0.3, stale_ttl=60)
+    async with client_for(app) as client:
+        await client.get("/cached")
+        await asyncio.sleep(0.35)
+
+        responses = await asyncio.gather(*(client.get("/cached") for _ in range(CONCURRENCY)))
+        assert {response.headers["x-cache"] for response in responses} == {"STALE"}
+        assert {response.json()["run"] for response in responses} == {1}
+
+        # Let the background refresh finish
+        await asyncio.sleep(0.1)
+        refreshed = await client.get("/cached")
+
+    assert app.state.runs == 2
+    assert refreshed.headers["x-cache"] == "HIT"
+    assert refreshed.json()["run"] == 2
+
+
+async def test_replayed_responses_are_labelled_with_their_route():
+    app = build_app(ResponseCache(), ttl=60)
+    labels = ("GET", "/cached", "200")
+    before = HTTP_REQUESTS._values.get(labels, 0)
+    async with client_for(app) as client:
+        for _ in range(3):
+            await client.get("/cached")
+
+    assert HTTP_REQUESTS._values.get(labels, 0) - before == 3
+
+
+async def test_invalidating_a_tag_drops_its_responses():
+    cache = ResponseCache()
+    app = build_app(cache, ttl=60)
+    async with client_for(app) as client:
+        await client.get("/cached")
+        assert (await client.get("/cached")).headers["x-cache"] == "HIT"
+
+        cache.invalidate("things")
+        response = await client.get("/cached")
+
+    assert response.headers["x-cache"] == "MISS"
+    assert app.state.runs == 2
+
+
+def test_invalidate_only_touches_tagged_entries():
+    cache = ResponseCache()
+    cache.put(("a",), entry(tags=("things",)))
+    cache.put(("b",), entry(tags=("other",)))
+
+    cache.invalidate("things")
+
+    assert cache.get(("a",)) is None
+    assert cache.get(("b",)) is not None
+    assert cache.stats()["tags"] == {"other": 1}
+
+
+def test_generation_changes_on_invalidation():
+    cache = ResponseCache()
+    before = cache.generation(("things",))
+    cache.invalidate("things")
+    assert cache.generation(("things",)) != before
+
+
+def test_lru_bound_evicts_oldest():
+    cache = ResponseCache(max_entries=2)
+    cache.put(("a",), entry())
+    cache.put(("b",), entry())
+    cache.get(("a",))
+    cache.put(("c",), entry())
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None
+    assert len(cache) == 2